@@ -5,11 +5,226 @@ Optical flow accuracy metrics.
 Standard metrics used in optical flow literature.
 """
 
-from typing import Optional, Tuple
+import math
+from typing import Any, Optional, Tuple
 
 import numpy as np
 import numpy.typing as npt
 
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(inline="always", fastmath=True)
+    def _pixel_angle(
+        up: float, vp: float, u_true: float, v_true: float, inv_norm_true: float
+    ) -> float:
+        """Angle (radians) between (up, vp, 1) and the ground truth (u_true, v_true, 1)."""
+        cos = (up * u_true + vp * v_true + 1.0) * inv_norm_true
+        cos = cos / math.sqrt(up * up + vp * vp + 1.0)
+        return math.acos(min(max(cos, -1.0), 1.0))
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _fused_metrics(
+        u_pred: Any, v_pred: Any, u_true: float, v_true: float, mask: Any
+    ) -> Tuple[float, float, float, float, float, int]:
+        """
+        Accumulate every metric's per-pixel sum in a single pass over the flow field.
+
+        Args:
+            u_pred: Flattened predicted horizontal flow
+            v_pred: Flattened predicted vertical flow
+            u_true: Ground truth horizontal flow (constant)
+            v_true: Ground truth vertical flow (constant)
+            mask: Flattened boolean mask, or None to use every pixel
+
+        Returns:
+            Tuple of (sum |du|, sum |dv|, sum du^2+dv^2, sum EPE, sum AAE in radians, count)
+        """
+        inv_norm_true = 1.0 / math.sqrt(u_true * u_true + v_true * v_true + 1.0)
+
+        sum_abs_u = 0.0
+        sum_abs_v = 0.0
+        sum_sq = 0.0
+        sum_epe = 0.0
+        sum_aae = 0.0
+        count = 0
+
+        if mask is None:
+            for i in prange(u_pred.size):
+                up = u_pred[i]
+                vp = v_pred[i]
+                du = up - u_true
+                dv = vp - v_true
+                s = du * du + dv * dv
+                sum_abs_u += abs(du)
+                sum_abs_v += abs(dv)
+                sum_sq += s
+                sum_epe += math.sqrt(s)
+                sum_aae += _pixel_angle(up, vp, u_true, v_true, inv_norm_true)
+                count += 1
+        else:
+            for i in prange(u_pred.size):
+                if mask[i]:
+                    up = u_pred[i]
+                    vp = v_pred[i]
+                    du = up - u_true
+                    dv = vp - v_true
+                    s = du * du + dv * dv
+                    sum_abs_u += abs(du)
+                    sum_abs_v += abs(dv)
+                    sum_sq += s
+                    sum_epe += math.sqrt(s)
+                    sum_aae += _pixel_angle(up, vp, u_true, v_true, inv_norm_true)
+                    count += 1
+
+        return sum_abs_u, sum_abs_v, sum_sq, sum_epe, sum_aae, count
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _aae_kernel(u_pred: Any, v_pred: Any, u_true: float, v_true: float, mask: Any) -> float:
+        """
+        Average angular error in degrees, without the other metrics' accumulators.
+
+        Args:
+            u_pred: Flattened predicted horizontal flow
+            v_pred: Flattened predicted vertical flow
+            u_true: Ground truth horizontal flow (constant)
+            v_true: Ground truth vertical flow (constant)
+            mask: Flattened boolean mask, or None to use every pixel
+
+        Returns:
+            Average angular error in degrees (NaN if no pixels are selected)
+        """
+        inv_norm_true = 1.0 / math.sqrt(u_true * u_true + v_true * v_true + 1.0)
+
+        sum_rad = 0.0
+        count = 0
+
+        if mask is None:
+            for i in prange(u_pred.size):
+                sum_rad += _pixel_angle(u_pred[i], v_pred[i], u_true, v_true, inv_norm_true)
+                count += 1
+        else:
+            for i in prange(u_pred.size):
+                if mask[i]:
+                    sum_rad += _pixel_angle(u_pred[i], v_pred[i], u_true, v_true, inv_norm_true)
+                    count += 1
+
+        if count == 0:
+            return np.nan
+
+        return sum_rad / count * (180.0 / math.pi)
+
+
+def _fused_means(
+    u_pred: npt.NDArray[np.float32],
+    v_pred: npt.NDArray[np.float32],
+    u_true: float,
+    v_true: float,
+    mask: Optional[npt.NDArray[np.bool_]],
+) -> Tuple[float, float, float, float, float]:
+    """
+    Run the fused Numba kernel and normalize its sums by the pixel count.
+
+    Returns:
+        Tuple of (mae_u, mae_v, mean squared error, epe, aae in degrees)
+    """
+    flat_mask = None if mask is None else mask.ravel()
+    sum_abs_u, sum_abs_v, sum_sq, sum_epe, sum_aae, count = _fused_metrics(
+        u_pred.ravel(), v_pred.ravel(), float(u_true), float(v_true), flat_mask
+    )
+
+    if count == 0:
+        nan = float("nan")
+        return nan, nan, nan, nan, nan
+
+    return (
+        sum_abs_u / count,
+        sum_abs_v / count,
+        sum_sq / count,
+        sum_epe / count,
+        math.degrees(sum_aae / count),
+    )
+
+
+def _gather(
+    u_pred: npt.NDArray[np.float32],
+    v_pred: npt.NDArray[np.float32],
+    mask: Optional[npt.NDArray[np.bool_]],
+) -> Tuple[npt.NDArray[np.float32], npt.NDArray[np.float32]]:
+    """Gather masked pixels into flat arrays; unmasked fields are raveled in place."""
+    if mask is None:
+        return u_pred.ravel(), v_pred.ravel()
+    return u_pred[mask], v_pred[mask]
+
+
+def _mae_packed(
+    up: npt.NDArray[np.float32], vp: npt.NDArray[np.float32], u_true: float, v_true: float
+) -> Tuple[float, float]:
+    """MAE on already-masked, flattened flow components."""
+    mae_u = float(np.mean(np.abs(up - u_true)))
+    mae_v = float(np.mean(np.abs(vp - v_true)))
+
+    return mae_u, mae_v
+
+
+def _rmse_packed(
+    up: npt.NDArray[np.float32], vp: npt.NDArray[np.float32], u_true: float, v_true: float
+) -> float:
+    """RMSE on already-masked, flattened flow components."""
+    error_u = up - u_true
+    error_v = vp - v_true
+
+    # Dot products reduce the squares in one pass without an HxW temporary
+    squared_sum = np.dot(error_u, error_u) + np.dot(error_v, error_v)
+
+    return float(np.sqrt(squared_sum / error_u.size))
+
+
+def _epe_packed(
+    up: npt.NDArray[np.float32], vp: npt.NDArray[np.float32], u_true: float, v_true: float
+) -> float:
+    """EPE on already-masked, flattened flow components."""
+    error_u = up - u_true
+    error_v = vp - v_true
+    epe = np.hypot(error_u, error_v, out=error_u)  # Single pass, reuses error_u buffer
+
+    return float(np.mean(epe))
+
+
+def _aae_packed(
+    up: npt.NDArray[np.float32], vp: npt.NDArray[np.float32], u_true: float, v_true: float
+) -> float:
+    """AAE (degrees) on already-masked, flattened flow components."""
+    # Ground truth is constant, so its squared magnitude and 3D norm are plain floats
+    nt2 = u_true * u_true + v_true * v_true
+    norm_true = math.sqrt(nt2 + 1.0)
+
+    # Check if both ground truth and predictions are near zero (compare squared magnitudes)
+    if nt2 < 1e-12 and np.all(up * up + vp * vp < 1e-12):
+        return 0.0  # Avoid div/0
+
+    # Normalize 3D vectors (u, v, 1)
+    norm_pred = np.sqrt(up * up + vp * vp + 1.0)
+
+    # Dot product (third components are both 1), broadcast against the scalar truth
+    dot_product = (up * u_true + vp * v_true + 1.0) / (norm_pred * norm_true)
+
+    # Clamp to [-1, 1] for numerical stability
+    dot_product = np.clip(dot_product, -1.0, 1.0)
+
+    # Angular error in radians -> degrees
+    angular_error_rad = np.arccos(dot_product)
+    angular_error_deg = np.rad2deg(angular_error_rad)
+
+    return float(np.mean(angular_error_deg))
+
 
 def mean_absolute_error(
     u_pred: npt.NDArray[np.float32],
@@ -31,13 +246,8 @@ def mean_absolute_error(
     Returns:
         Tuple of (mae_u, mae_v)
     """
-    if mask is None:
-        mask = np.ones_like(u_pred, dtype=bool)
-
-    mae_u = float(np.mean(np.abs(u_pred[mask] - u_true)))
-    mae_v = float(np.mean(np.abs(v_pred[mask] - v_true)))
-
-    return mae_u, mae_v
+    up, vp = _gather(u_pred, v_pred, mask)
+    return _mae_packed(up, vp, u_true, v_true)
 
 
 def root_mean_square_error(
@@ -60,14 +270,8 @@ def root_mean_square_error(
     Returns:
         RMSE in pixels
     """
-    if mask is None:
-        mask = np.ones_like(u_pred, dtype=bool)
-
-    error_u = u_pred[mask] - u_true
-    error_v = v_pred[mask] - v_true
-    squared_error = error_u**2 + error_v**2
-
-    return float(np.sqrt(np.mean(squared_error)))
+    up, vp = _gather(u_pred, v_pred, mask)
+    return _rmse_packed(up, vp, u_true, v_true)
 
 
 def endpoint_error(
@@ -93,14 +297,8 @@ def endpoint_error(
     Returns:
         Average EPE in pixels
     """
-    if mask is None:
-        mask = np.ones_like(u_pred, dtype=bool)
-
-    error_u = u_pred[mask] - u_true
-    error_v = v_pred[mask] - v_true
-    epe = np.sqrt(error_u**2 + error_v**2)
-
-    return float(np.mean(epe))
+    up, vp = _gather(u_pred, v_pred, mask)
+    return _epe_packed(up, vp, u_true, v_true)
 
 
 def angular_error(
@@ -126,41 +324,14 @@ def angular_error(
     Returns:
         Average angular error in degrees
     """
-    if mask is None:
-        mask = np.ones_like(u_pred, dtype=bool)
-
-    # Convert to 3D vectors (u, v, 1)
-    u_pred_3d = u_pred[mask]
-    v_pred_3d = v_pred[mask]
-    w_pred = np.ones_like(u_pred_3d)
+    if NUMBA_AVAILABLE:
+        flat_mask = None if mask is None else mask.ravel()
+        return float(
+            _aae_kernel(u_pred.ravel(), v_pred.ravel(), float(u_true), float(v_true), flat_mask)
+        )
 
-    u_true_arr = np.full_like(u_pred_3d, u_true)
-    v_true_arr = np.full_like(v_pred_3d, v_true)
-    w_true = np.ones_like(u_true_arr)
-
-    # Check if both ground truth and predictions are near zero
-    mag_true = np.sqrt(u_true**2 + v_true**2)
-    mag_pred = np.sqrt(u_pred_3d**2 + v_pred_3d**2)
-    if mag_true < 1e-6 and np.all(mag_pred < 1e-6):
-        return 0.0  # Avoid div/0
-
-    # Normalize vectors
-    norm_pred = np.sqrt(u_pred_3d**2 + v_pred_3d**2 + w_pred**2)
-    norm_true = np.sqrt(u_true_arr**2 + v_true_arr**2 + w_true**2)
-
-    # Dot product
-    dot_product = (u_pred_3d * u_true_arr + v_pred_3d * v_true_arr + w_pred * w_true) / (
-        norm_pred * norm_true
-    )
-
-    # Clamp to [-1, 1] for numerical stability
-    dot_product = np.clip(dot_product, -1.0, 1.0)
-
-    # Angular error in radians -> degrees
-    angular_error_rad = np.arccos(dot_product)
-    angular_error_deg = np.rad2deg(angular_error_rad)
-
-    return float(np.mean(angular_error_deg))
+    up, vp = _gather(u_pred, v_pred, mask)
+    return _aae_packed(up, vp, u_true, v_true)
 
 
 def compute_all_metrics(
@@ -187,10 +358,17 @@ def compute_all_metrics(
             - epe: Average endpoint error
             - aae: Average angular error (degrees)
     """
-    mae_u, mae_v = mean_absolute_error(u_pred, v_pred, u_true, v_true, mask)
-    rmse = root_mean_square_error(u_pred, v_pred, u_true, v_true, mask)
-    epe = endpoint_error(u_pred, v_pred, u_true, v_true, mask)
-    aae = angular_error(u_pred, v_pred, u_true, v_true, mask)
+    if NUMBA_AVAILABLE:
+        # Single pass over the field instead of one masked copy per metric
+        mae_u, mae_v, mse, epe, aae = _fused_means(u_pred, v_pred, u_true, v_true, mask)
+        rmse = math.sqrt(mse)
+    else:
+        # Gather the masked pixels once and share them across every metric
+        up, vp = _gather(u_pred, v_pred, mask)
+        mae_u, mae_v = _mae_packed(up, vp, u_true, v_true)
+        rmse = _rmse_packed(up, vp, u_true, v_true)
+        epe = _epe_packed(up, vp, u_true, v_true)
+        aae = _aae_packed(up, vp, u_true, v_true)
 
     return {
         "mae_u": mae_u,
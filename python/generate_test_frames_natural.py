@@ -3,10 +3,13 @@
 """Generate test frames using natural image patterns."""
 
 import argparse
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
 
+import cv2
 import numpy as np
+from generate_test_suite import HEX_LUT
 from numpy.typing import NDArray
 from PIL import Image
 
@@ -16,8 +19,14 @@ CACHE_DIR = SCRIPT_DIR / "test_data"
 CACHED_IMAGE = CACHE_DIR / "mountain_texture.jpg"
 
 
+@functools.lru_cache(maxsize=1)
 def load_test_image() -> np.ndarray:
-    """Load the cached natural texture image."""
+    """
+    Load the cached natural texture image.
+
+    The decoded array is memoized for the process lifetime and shared between
+    callers, so it is returned read-only.
+    """
     if not CACHED_IMAGE.exists():
         raise FileNotFoundError(
             f"Natural texture image not found at {CACHED_IMAGE}. "
@@ -25,7 +34,11 @@ def load_test_image() -> np.ndarray:
         )
 
     img = Image.open(CACHED_IMAGE).convert("L")
-    return np.array(img, dtype=np.uint8)
+    arr = np.asarray(img)  # "L" images are already uint8, so this avoids a second copy
+    if arr.dtype != np.uint8:
+        arr = arr.astype(np.uint8)
+    arr.flags.writeable = False
+    return arr
 
 
 def generate_natural_pattern(width: int = 320, height: int = 240) -> NDArray[np.uint8]:
@@ -37,9 +50,13 @@ def generate_natural_pattern(width: int = 320, height: int = 240) -> NDArray[np.
     # Load image
     try:
         img = load_test_image()
-        # Crop/resize to desired dimensions
-        img_resized = Image.fromarray(img).resize((width, height))
-        return np.array(img_resized, dtype=np.uint8)
+        # Crop/resize to desired dimensions. BILINEAR rather than the BICUBIC default: a
+        # cheaper filter that still antialiases the downscale (NEAREST would alias the texture)
+        img_resized = Image.fromarray(img).resize(
+            (width, height), resample=Image.Resampling.BILINEAR
+        )
+        resized = np.asarray(img_resized)
+        return resized if resized.dtype == np.uint8 else resized.astype(np.uint8)
     except Exception as e:
         print(f"Error loading natural image: {e}")
         print("Falling back to synthetic pattern...")
@@ -48,29 +65,67 @@ def generate_natural_pattern(width: int = 320, height: int = 240) -> NDArray[np.
 
 def generate_smooth_synthetic(width: int, height: int) -> NDArray[np.uint8]:
     """Create smooth synthetic texture using sum of sinusoids."""
-    x = np.linspace(0, 4 * np.pi, width)
-    y = np.linspace(0, 3 * np.pi, height)
-    X, Y = np.meshgrid(x, y)
+    # Row/column vectors broadcast to HxW only in the final products (no meshgrid)
+    X = np.linspace(0, 4 * np.pi, width, dtype=np.float32)[None, :]
+    Y = np.linspace(0, 3 * np.pi, height, dtype=np.float32)[:, None]
 
     # Multiple frequency components for rich texture
-    pattern = (
+    pattern: NDArray[np.float32] = (
         128
         + 50 * np.sin(X) * np.cos(Y)
         + 30 * np.cos(2 * X + 0.5) * np.sin(1.5 * Y)
         + 20 * np.sin(3 * X - 0.3) * np.cos(2.5 * Y + 0.7)
     )
 
-    clipped: NDArray[Any] = np.clip(pattern, 0, 255)
-    return clipped.astype(np.uint8)
+    # Clip in place (pattern is a fresh temporary), then a single uint8 cast
+    np.clip(pattern, 0.0, 255.0, out=pattern)
+    return pattern.astype(np.uint8)
 
 
 def apply_motion(frame: np.ndarray, dx: float, dy: float) -> NDArray[np.uint8]:
     """Apply sub-pixel motion using bilinear interpolation."""
-    from scipy.ndimage import shift
+    height, width = frame.shape
+
+    # Pure translation, dst(x, y) = src(x - dx, y - dy): the pattern moves, not the viewport
+    M = np.array([[1.0, 0.0, dx], [0.0, 1.0, dy]], dtype=np.float32)
+
+    # OpenCV's 8-bit bilinear warp, uncovered border filled with gray like before
+    shifted = cv2.warpAffine(
+        frame,
+        M,
+        (width, height),
+        flags=cv2.INTER_LINEAR,
+        borderMode=cv2.BORDER_CONSTANT,
+        borderValue=128,
+    )
+    return shifted.astype(np.uint8, copy=False)
+
+
+def save_as_mem_file(frame: NDArray[np.uint8], filename: Path) -> None:
+    """
+    Save frame as a .mem file (one hex byte per line) for Verilog $readmemh.
+
+    Pixels are formatted through the suite generator's hex lookup table,
+    so the whole frame is built by NumPy and written in a single call.
+    The 1 MiB buffer keeps large frames from being flushed in small chunks.
+    """
+    with open(filename, "wb", buffering=1 << 20) as f:
+        f.write(HEX_LUT[frame.ravel()].tobytes())
 
-    # Negative because pattern moves, not viewport
-    shifted: NDArray[Any] = shift(frame, (dy, dx), order=1, mode="constant", cval=128)
-    return shifted.astype(np.uint8)
+
+def save_frame_files(frame: NDArray[np.uint8], stem: Path, fmt: str = "both") -> None:
+    """
+    Save frame as raw binary (<stem>.bin) and/or Verilog hex (<stem>.mem).
+
+    Args:
+        frame: Frame to save
+        stem: Output path without suffix
+        fmt: "bin", "mem" or "both"
+    """
+    if fmt in ("bin", "both"):
+        frame.tofile(stem.with_suffix(".bin"))
+    if fmt in ("mem", "both"):
+        save_as_mem_file(frame, stem.with_suffix(".mem"))
 
 
 def main() -> None:
@@ -86,6 +141,12 @@ def main() -> None:
         action="store_true",
         help="Use synthetic pattern (for debug)",
     )
+    parser.add_argument(
+        "--format",
+        choices=["mem", "bin", "both"],
+        default="both",
+        help="Output format(s): hex .mem for $readmemh, raw .bin for $fread (default: both)",
+    )
 
     args = parser.parse_args()
 
@@ -105,29 +166,31 @@ def main() -> None:
     # Apply motion to create frame 1
     frame_1 = apply_motion(frame_0, args.displacement_x, args.displacement_y)
 
-    # Save as binary
-    frame_0.tofile(output_dir / "frame_00.bin")
-    frame_1.tofile(output_dir / "frame_01.bin")
-
-    # Save as .mem for Verilog
-    with open(output_dir / "frame_00.mem", "w") as f:
-        for val in frame_0.flatten():
-            f.write(f"{val:02x}\n")
-
-    with open(output_dir / "frame_01.mem", "w") as f:
-        for val in frame_1.flatten():
-            f.write(f"{val:02x}\n")
-
-    print(f"\nSaved: {output_dir}/frame_00.bin")
-    print(f"Saved: {output_dir}/frame_01.bin")
-    print(f"Saved: {output_dir}/frame_00.mem")
-    print(f"Saved: {output_dir}/frame_01.mem")
-
-    # Statistics
+    # Save both frames concurrently; the hex gather and file writes release the GIL
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(save_frame_files, frame_0, output_dir / "frame_00", args.format),
+            executor.submit(save_frame_files, frame_1, output_dir / "frame_01", args.format),
+        ]
+        for future in futures:
+            future.result()  # Re-raise any write error
+
+    print()
+    suffixes = [ext for ext in ("bin", "mem") if args.format in (ext, "both")]
+    for suffix in suffixes:
+        print(f"Saved: {output_dir}/frame_00.{suffix}")
+        print(f"Saved: {output_dir}/frame_01.{suffix}")
+
+    # Statistics (single pass: derive everything from the 256-bin intensity histogram)
+    counts = np.bincount(frame_0.ravel(), minlength=256)
+    levels = np.arange(256, dtype=np.float64)
+    mean = float(counts @ levels) / frame_0.size
+    std = np.sqrt(float(counts @ (levels - mean) ** 2) / frame_0.size)
+    present = np.flatnonzero(counts)
     print("\nFrame statistics:")
-    print(f"  Mean intensity: {np.mean(frame_0):.1f}")
-    print(f"  Std dev: {np.std(frame_0):.1f}")
-    print(f"  Min/Max: {np.min(frame_0)}/{np.max(frame_0)}")
+    print(f"  Mean intensity: {mean:.1f}")
+    print(f"  Std dev: {std:.1f}")
+    print(f"  Min/Max: {present[0]}/{present[-1]}")
 
 
 if __name__ == "__main__":
@@ -19,14 +19,16 @@ Usage:
 """
 
 import argparse
-import json
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Optional, Sequence, Tuple
 
 import cv2
 import numpy as np
 import numpy.typing as npt
+from json_io import write_json
 from PIL import Image
 
 # Cache directory for base textures
@@ -36,6 +38,12 @@ CACHED_IMAGE = CACHE_DIR / "mountain_texture.jpg"
 # Output directory structure
 TEST_SUITE_DIR = Path(__file__).parent / "test_suite"
 
+# Debug PNGs favour encode speed over size (zlib level 1 instead of the default)
+PNG_PARAMS = [cv2.IMWRITE_PNG_COMPRESSION, 1]
+
+# .mem line ("00\n" .. "ff\n") for every uint8 value, indexed by pixel value
+HEX_LUT = np.array([f"{i:02x}\n".encode() for i in range(256)], dtype="|S3")
+
 
 @dataclass
 class MotionParameters:
@@ -137,10 +145,14 @@ TEST_PATTERNS = {
 }
 
 
+@functools.lru_cache(maxsize=4)
 def load_base_texture(width: int = 320, height: int = 240) -> npt.NDArray[np.uint8]:
     """
     Load and resize the base natural texture image.
 
+    Results are memoized per (width, height) and shared between callers, so the
+    returned array is read-only.
+
     Args:
         width: Target width
         height: Target height
@@ -157,9 +169,13 @@ def load_base_texture(width: int = 320, height: int = 240) -> npt.NDArray[np.uin
             "Please ensure mountain_texture.jpg exists in python/test_data/"
         )
 
+    # PIL's BILINEAR resize widens its filter with the reduction (no aliasing); the suite
+    # metrics and regression baseline were produced from this exact texture
     img = Image.open(CACHED_IMAGE).convert("L")
     img_resized = img.resize((width, height), Image.Resampling.BILINEAR)
-    return np.array(img_resized, dtype=np.uint8)
+    texture = np.array(img_resized, dtype=np.uint8)
+    texture.flags.writeable = False
+    return texture
 
 
 def apply_motion_opencv(
@@ -201,7 +217,76 @@ def apply_motion_opencv(
         borderValue=128,
     )
 
-    return warped.astype(np.uint8)
+    return warped.astype(np.uint8, copy=False)  # Already uint8 for a uint8 input; no copy
+
+
+def save_test_pattern(
+    frame_0: npt.NDArray[np.uint8],
+    frame_1: npt.NDArray[np.uint8],
+    params: MotionParameters,
+    output_dir: Path,
+    save_mem: bool = True,
+    save_bin: bool = True,
+    save_png: bool = True,
+) -> None:
+    """
+    Write a generated frame pair and its metadata to output_dir / params.name.
+
+    Args:
+        frame_0: Base frame (uint8)
+        frame_1: Warped frame (uint8)
+        params: Motion parameters of the pattern
+        output_dir: Suite directory (the pattern gets its own subdirectory)
+        save_mem: Export .mem files for Verilog $readmemh
+        save_bin: Export raw binary files
+        save_png: Export PNG visualization
+    """
+    height, width = frame_0.shape
+    pattern_dir = output_dir / params.name
+    pattern_dir.mkdir(parents=True, exist_ok=True)
+
+    # Save metadata (ground truth)
+    metadata = {
+        "pattern_name": params.name,
+        "description": params.description,
+        "resolution": {"width": width, "height": height},
+        "motion_parameters": params.to_dict(),
+        "expected_flow": {
+            "u_mean": params.dx if params.rotation == 0 and params.scale == 1.0 else "variable",
+            "v_mean": params.dy if params.rotation == 0 and params.scale == 1.0 else "variable",
+            "note": "For rotation/zoom, flow varies spatially. Use test regions.",
+        },
+    }
+
+    write_json(pattern_dir / "metadata.json", metadata)
+
+    # Binary format (for Python processing)
+    if save_bin:
+        frame_0.tofile(pattern_dir / "frame_00.bin")
+        frame_1.tofile(pattern_dir / "frame_01.bin")
+
+    # Hex memory format (for RTL testbenches)
+    if save_mem:
+        (pattern_dir / "frame_00.mem").write_bytes(HEX_LUT[frame_0.ravel()].tobytes())
+        (pattern_dir / "frame_01.mem").write_bytes(HEX_LUT[frame_1.ravel()].tobytes())
+
+    # PNG visualization (for documentation/debugging)
+    if save_png:
+        cv2.imwrite(str(pattern_dir / "frame_00.png"), frame_0, PNG_PARAMS)
+        cv2.imwrite(str(pattern_dir / "frame_01.png"), frame_1, PNG_PARAMS)
+
+        # Side-by-side comparison (both frames written into one preallocated buffer)
+        comparison = np.empty((height, 2 * width), dtype=np.uint8)
+        comparison[:, :width] = frame_0
+        comparison[:, width:] = frame_1
+        cv2.imwrite(str(pattern_dir / "comparison.png"), comparison, PNG_PARAMS)
+
+    # One print call, so lines from concurrent writers don't interleave
+    print(
+        f"  Generated: {params.name}\n"
+        f"    Motion: dx={params.dx:.1f}, dy={params.dy:.1f}, "
+        f"rot={params.rotation:.1f}°, scale={params.scale:.2f}"
+    )
 
 
 def generate_test_pattern(
@@ -212,6 +297,7 @@ def generate_test_pattern(
     save_mem: bool = True,
     save_bin: bool = True,
     save_png: bool = True,
+    base_frame: Optional[npt.NDArray[np.uint8]] = None,
 ) -> Tuple[npt.NDArray[np.uint8], npt.NDArray[np.uint8]]:
     """
     Generate a single test pattern (frame pair + metadata).
@@ -224,70 +310,48 @@ def generate_test_pattern(
         save_mem: Export .mem files for Verilog $readmemh
         save_bin: Export raw binary files
         save_png: Export PNG visualization
+        base_frame: Pre-loaded base texture (None = load it)
 
     Returns:
         Tuple of (frame_0, frame_1) as uint8 arrays
     """
     # Load base texture
-    frame_0 = load_base_texture(width, height)
+    frame_0 = base_frame if base_frame is not None else load_base_texture(width, height)
 
     # Apply motion to create frame_1
     frame_1 = apply_motion_opencv(frame_0, params)
 
     # Save outputs if directory specified
     if output_dir is not None:
-        pattern_dir = output_dir / params.name
-        pattern_dir.mkdir(parents=True, exist_ok=True)
-
-        # Save metadata (ground truth)
-        metadata = {
-            "pattern_name": params.name,
-            "description": params.description,
-            "resolution": {"width": width, "height": height},
-            "motion_parameters": params.to_dict(),
-            "expected_flow": {
-                "u_mean": params.dx if params.rotation == 0 and params.scale == 1.0 else "variable",
-                "v_mean": params.dy if params.rotation == 0 and params.scale == 1.0 else "variable",
-                "note": "For rotation/zoom, flow varies spatially. Use test regions.",
-            },
-        }
-
-        with open(pattern_dir / "metadata.json", "w") as f:
-            json.dump(metadata, f, indent=2)
-
-        # Binary format (for Python processing)
-        if save_bin:
-            frame_0.tofile(pattern_dir / "frame_00.bin")
-            frame_1.tofile(pattern_dir / "frame_01.bin")
-
-        # Hex memory format (for RTL testbenches)
-        if save_mem:
-            with open(pattern_dir / "frame_00.mem", "w") as f:
-                for val in frame_0.flatten():
-                    f.write(f"{val:02x}\n")
-
-            with open(pattern_dir / "frame_01.mem", "w") as f:
-                for val in frame_1.flatten():
-                    f.write(f"{val:02x}\n")
-
-        # PNG visualization (for documentation/debugging)
-        if save_png:
-            Image.fromarray(frame_0).save(pattern_dir / "frame_00.png")
-            Image.fromarray(frame_1).save(pattern_dir / "frame_01.png")
-
-            # Side-by-side comparison
-            comparison = np.hstack([frame_0, frame_1])
-            Image.fromarray(comparison).save(pattern_dir / "comparison.png")
-
-        print(f"  Generated: {params.name}")
-        print(
-            f"    Motion: dx={params.dx:.1f}, dy={params.dy:.1f}, "
-            f"rot={params.rotation:.1f}°, scale={params.scale:.2f}"
-        )
+        save_test_pattern(frame_0, frame_1, params, output_dir, save_mem, save_bin, save_png)
 
     return frame_0, frame_1
 
 
+def _warp_and_save_patterns(
+    base: npt.NDArray[np.uint8], patterns: Sequence[MotionParameters], output_dir: Path
+) -> None:
+    """
+    Warp each pattern from the base texture and save it.
+
+    PNG encoding and file writes release the GIL, so they run on background threads while
+    this thread warps the next pattern.
+    """
+    with ThreadPoolExecutor(max_workers=2) as io_pool:
+        writes = [
+            io_pool.submit(
+                save_test_pattern,
+                base,
+                apply_motion_opencv(base, params),
+                params,
+                output_dir,
+            )
+            for params in patterns
+        ]
+        for write in writes:
+            write.result()  # Re-raise any I/O error
+
+
 def generate_full_suite(
     width: int = 320, height: int = 240, output_dir: Optional[Path] = None
 ) -> None:
@@ -312,8 +376,15 @@ def generate_full_suite(
     print(f"Number of patterns: {len(TEST_PATTERNS)}")
     print("")
 
-    for pattern_name, params in TEST_PATTERNS.items():
-        generate_test_pattern(params, width, height, output_dir)
+    # Decode and resize the texture once; every pattern warps the same base frame
+    base = load_base_texture(width, height)
+
+    patterns = list(TEST_PATTERNS.values())
+
+    # Patterns are generated in this process; each one's file writes overlap the next warp.
+    # A process pool was slower at every suite size measured (spawned workers re-import
+    # numpy and cv2, which costs more than the warps being split)
+    _warp_and_save_patterns(base, patterns, output_dir)
 
     # Generate suite index (for test runners)
     suite_index = {
@@ -323,8 +394,7 @@ def generate_full_suite(
         "patterns": {name: params.to_dict() for name, params in TEST_PATTERNS.items()},
     }
 
-    with open(output_dir / "suite_index.json", "w") as f:
-        json.dump(suite_index, f, indent=2)
+    write_json(output_dir / "suite_index.json", suite_index)
 
     print("")
     print("=" * 60)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# python/json_io.py
+"""
+JSON file helpers shared by the test suite generator and the verifier.
+Uses orjson when installed and falls back to the json module otherwise.
+"""
+
+import json
+import math
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _json_safe(value: Any) -> Any:
+    """Convert NumPy values to Python ones and non-finite floats to None, recursively."""
+    if isinstance(value, dict):
+        return {key: _json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return _json_safe(value.tolist())
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def read_json(path: Path) -> Any:
+    """
+    Parse a JSON file (orjson's native decoder when installed).
+
+    orjson rejects the NaN literals that older json-written files may contain, so those
+    files are parsed again with the json module.
+    """
+    if ORJSON_AVAILABLE:
+        raw = path.read_bytes()
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            return json.loads(raw)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_json(path: Path, data: dict[str, Any]) -> None:
+    """
+    Write data as 2-space indented JSON (orjson's native encoder when installed).
+
+    Both paths write null for non-finite floats and unescaped UTF-8, so the file doesn't
+    depend on which encoder produced it.
+    """
+    data = _json_safe(data)
+    if ORJSON_AVAILABLE:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False, allow_nan=False)
@@ -5,15 +5,240 @@ Core Lucas-Kanade single-scale implementation.
 Shared by both single-scale and pyramidal versions.
 """
 
-from typing import Tuple
+from typing import Any, Optional, Tuple
 
+import cv2
 import numpy as np
 import numpy.typing as npt
-from scipy import signal
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# Value of one Ix/Iy unit from compute_gradients_fixed (Sobel / 8 on half the frame sum)
+GRADIENT_FIXED_SCALE = 1.0 / 16.0
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(
+        [
+            "void(f4[:, ::1], f4[:, ::1], f4[:, ::1], i8, f8, f4[:, ::1], f4[:, ::1])",
+            "void(i2[:, ::1], i2[:, ::1], i2[:, ::1], i8, f8, f4[:, ::1], f4[:, ::1])",
+        ],
+        parallel=True,
+        fastmath=True,
+        cache=True,
+    )
+    def _lk_kernel(
+        Ix: Any, Iy: Any, It: Any, window_size: int, gradient_scale: float, u: Any, v: Any
+    ) -> None:
+        """
+        Fused Lucas-Kanade solve: running window sums and 2x2 solve per pixel, row bands in
+        parallel.
+
+        Args:
+            Ix: Spatial gradient in X direction (C-contiguous float32 or int16)
+            Iy: Spatial gradient in Y direction (C-contiguous float32 or int16)
+            It: Temporal gradient (C-contiguous float32 or int16)
+            window_size: Size of analysis window (must be odd)
+            gradient_scale: Value of one Ix/Iy unit
+            u: Horizontal flow output (C-contiguous float32), written in full
+            v: Vertical flow output (C-contiguous float32), written in full
+        """
+        height, width = Ix.shape
+        half_win = window_size // 2
+
+        # Sums are in gradient units: det scales by gradient_scale^4, u/v by 1/gradient_scale
+        det_min = 1e-4 / gradient_scale**4
+        # Every pixel is written below (border strips and textureless pixels get zero),
+        # so the outputs need no memset
+        u[:half_win] = 0.0
+        v[:half_win] = 0.0
+        u[height - half_win :] = 0.0
+        v[height - half_win :] = 0.0
+
+        # Rows are split into bands processed in parallel. Each band builds its column sums
+        # once and then slides them down a row at a time (add the entering row, drop the
+        # leaving one), so the cost per pixel does not grow with the window size
+        band_height = 32
+        num_bands = (height - 2 * half_win + band_height - 1) // band_height
+        for band in prange(num_bands):
+            y_start = half_win + band * band_height
+            y_end = min(y_start + band_height, height - half_win)
+
+            # Column sums of the five gradient products over the window rows. float64 holds
+            # float32 products and their sums exactly, so the sliding windows never drift
+            col = np.zeros((5, width), dtype=np.float64)
+            for yy in range(y_start - half_win, y_start + half_win):
+                for x in range(width):
+                    a = np.float64(Ix[yy, x])
+                    b = np.float64(Iy[yy, x])
+                    c = np.float64(It[yy, x])
+                    col[0, x] += a * a
+                    col[1, x] += b * b
+                    col[2, x] += a * b
+                    col[3, x] += a * c
+                    col[4, x] += b * c
+
+            for y in range(y_start, y_end):
+                u[y, :half_win] = 0.0
+                v[y, :half_win] = 0.0
+                u[y, width - half_win :] = 0.0
+                v[y, width - half_win :] = 0.0
+
+                enter_row = y + half_win
+                for x in range(width):
+                    a = np.float64(Ix[enter_row, x])
+                    b = np.float64(Iy[enter_row, x])
+                    c = np.float64(It[enter_row, x])
+                    col[0, x] += a * a
+                    col[1, x] += b * b
+                    col[2, x] += a * b
+                    col[3, x] += a * c
+                    col[4, x] += b * c
+
+                # Slide the window horizontally: add the entering column, drop the leaving one
+                sxx = 0.0
+                syy = 0.0
+                sxy = 0.0
+                sxt = 0.0
+                syt = 0.0
+                for x in range(window_size - 1):
+                    sxx += col[0, x]
+                    syy += col[1, x]
+                    sxy += col[2, x]
+                    sxt += col[3, x]
+                    syt += col[4, x]
+
+                for x in range(half_win, width - half_win):
+                    enter = x + half_win
+                    sxx += col[0, enter]
+                    syy += col[1, enter]
+                    sxy += col[2, enter]
+                    sxt += col[3, enter]
+                    syt += col[4, enter]
+
+                    # Textureless pixels get a zero reciprocal, hence zero flow
+                    det = sxx * syy - sxy * sxy
+                    inv_det = 1.0 / (det * gradient_scale) if abs(det) > det_min else 0.0
+                    u[y, x] = (sxy * syt - syy * sxt) * inv_det
+                    v[y, x] = (sxy * sxt - sxx * syt) * inv_det
+
+                    leave = x - half_win
+                    sxx -= col[0, leave]
+                    syy -= col[1, leave]
+                    sxy -= col[2, leave]
+                    sxt -= col[3, leave]
+                    syt -= col[4, leave]
+
+                leave_row = y - half_win
+                for x in range(width):
+                    a = np.float64(Ix[leave_row, x])
+                    b = np.float64(Iy[leave_row, x])
+                    c = np.float64(It[leave_row, x])
+                    col[0, x] -= a * a
+                    col[1, x] -= b * b
+                    col[2, x] -= a * b
+                    col[3, x] -= a * c
+                    col[4, x] -= b * c
+
+    @njit(
+        [
+            "void(f4[:, ::1], f4[:, ::1], f4[:, ::1], f8, f4[:, ::1], f4[:, ::1])",
+            "void(i2[:, ::1], i2[:, ::1], i2[:, ::1], f8, f4[:, ::1], f4[:, ::1])",
+        ],
+        parallel=True,
+        fastmath=True,
+        cache=True,
+    )
+    def _lk5(Ix: Any, Iy: Any, It: Any, gradient_scale: float, u: Any, v: Any) -> None:
+        """
+        _lk_kernel hard-wired to the default 5x5 window (as the HDL core is).
+
+        The literal ranges let LLVM fully unroll both 5-tap reductions and keep the
+        accumulators in registers. The result matches the generic kernel up to
+        floating-point rounding (fastmath may reorder the unrolled sums).
+
+        Args:
+            Ix: Spatial gradient in X direction (C-contiguous float32 or int16)
+            Iy: Spatial gradient in Y direction (C-contiguous float32 or int16)
+            It: Temporal gradient (C-contiguous float32 or int16)
+            gradient_scale: Value of one Ix/Iy unit
+            u: Horizontal flow output (C-contiguous float32), written in full
+            v: Vertical flow output (C-contiguous float32), written in full
+        """
+        height, width = Ix.shape
+
+        det_min = 1e-4 / gradient_scale**4
+        u[:2] = 0.0
+        v[:2] = 0.0
+        u[height - 2 :] = 0.0
+        v[height - 2 :] = 0.0
+
+        for y in prange(2, height - 2):
+            u[y, :2] = 0.0
+            v[y, :2] = 0.0
+            u[y, width - 2 :] = 0.0
+            v[y, width - 2 :] = 0.0
+
+            col = np.zeros((5, width), dtype=np.float64)
+            for x in range(width):
+                for dy in range(-2, 3):
+                    a = np.float64(Ix[y + dy, x])
+                    b = np.float64(Iy[y + dy, x])
+                    c = np.float64(It[y + dy, x])
+                    col[0, x] += a * a
+                    col[1, x] += b * b
+                    col[2, x] += a * b
+                    col[3, x] += a * c
+                    col[4, x] += b * c
+
+            for x in range(2, width - 2):
+                sxx = 0.0
+                syy = 0.0
+                sxy = 0.0
+                sxt = 0.0
+                syt = 0.0
+                for dx in range(-2, 3):
+                    sxx += col[0, x + dx]
+                    syy += col[1, x + dx]
+                    sxy += col[2, x + dx]
+                    sxt += col[3, x + dx]
+                    syt += col[4, x + dx]
+
+                # Textureless pixels get a zero reciprocal, hence zero flow
+                det = sxx * syy - sxy * sxy
+                inv_det = 1.0 / (det * gradient_scale) if abs(det) > det_min else 0.0
+                u[y, x] = (sxy * syt - syy * sxt) * inv_det
+                v[y, x] = (sxy * sxt - sxx * syt) * inv_det
+
+
+def _window_sum(image: npt.NDArray[np.float32], window_size: int) -> npt.NDArray[np.float64]:
+    """
+    Sum of each full window_size x window_size neighbourhood via a summed-area table.
+
+    Each window costs four lookups regardless of its size. The table is float64, which
+    holds sums of float32 products exactly. Only pixels with a full window are returned,
+    i.e. the result is (H - window_size + 1, W - window_size + 1).
+    """
+    table = cv2.integral(image, sdepth=cv2.CV_64F)
+
+    sums = (
+        table[window_size:, window_size:]
+        - table[:-window_size, window_size:]
+        - table[window_size:, :-window_size]
+        + table[:-window_size, :-window_size]
+    )
+    return sums.astype(np.float64, copy=False)
 
 
 def compute_gradients(
-    frame_prev: npt.NDArray[np.float32], frame_curr: npt.NDArray[np.float32]
+    frame_prev: npt.NDArray[Any], frame_curr: npt.NDArray[Any]
 ) -> Tuple[npt.NDArray[np.float32], npt.NDArray[np.float32], npt.NDArray[np.float32]]:
     """
     Compute spatial and temporal gradients using Sobel operators.
@@ -21,60 +246,129 @@ def compute_gradients(
     Spatial gradients (Ix, Iy) use Sobel kernels applied to the averaged frame.
     Temporal gradient is the simple frame difference: It = I_prev - I_curr.
 
+    uint8 frames are differentiated directly in int16 (no float32 average frame) and
+    converted at the end; the values are identical to the float32 path.
+
     Args:
-        frame_prev: Previous frame (grayscale, float32)
-        frame_curr: Current frame (grayscale, float32)
+        frame_prev: Previous frame (grayscale, float32 or uint8)
+        frame_curr: Current frame (grayscale, float32 or uint8)
 
     Returns:
         Tuple of (Ix, Iy, It) gradient arrays
     """
-    # Sobel kernels for spatial gradients (applied to average of frames)
-    sobel_x = np.array([[-1, 0, 1], [-2, 0, 2], [-1, 0, 1]], dtype=np.float32) / 8.0
-    sobel_y = np.array([[-1, -2, -1], [0, 0, 0], [1, 2, 1]], dtype=np.float32) / 8.0
+    if frame_prev.dtype == np.uint8 and frame_curr.dtype == np.uint8:
+        Ix16, Iy16, It16 = compute_gradients_fixed(frame_prev, frame_curr)
+        return (
+            Ix16.astype(np.float32) * np.float32(GRADIENT_FIXED_SCALE),
+            Iy16.astype(np.float32) * np.float32(GRADIENT_FIXED_SCALE),
+            It16.astype(np.float32),
+        )
 
     # Average frame for spatial gradients (reduces noise)
-    frame_avg = (frame_prev + frame_curr) / 2.0
+    frame_avg = cv2.addWeighted(frame_prev, 0.5, frame_curr, 0.5, 0.0)
 
-    # Compute spatial gradients via convolution
-    Ix = signal.convolve2d(frame_avg, sobel_x, mode="same", boundary="symm")
-    Iy = signal.convolve2d(frame_avg, sobel_y, mode="same", boundary="symm")
+    # Spatial gradients via OpenCV's separable 3x3 Sobel, normalized by 1/8. The negative scale
+    # gives true convolution (flipped kernel), so Ix, Iy share It's prev - curr sign convention
+    Ix = cv2.Sobel(
+        frame_avg, cv2.CV_32F, 1, 0, ksize=3, scale=-1 / 8.0, borderType=cv2.BORDER_REFLECT
+    )
+    Iy = cv2.Sobel(
+        frame_avg, cv2.CV_32F, 0, 1, ksize=3, scale=-1 / 8.0, borderType=cv2.BORDER_REFLECT
+    )
 
     # Temporal gradient (simple difference)
-    It = frame_prev - frame_curr
+    It = cv2.subtract(frame_prev, frame_curr)
+
+    return (
+        Ix.astype(np.float32, copy=False),
+        Iy.astype(np.float32, copy=False),
+        It.astype(np.float32, copy=False),
+    )
+
+
+def compute_gradients_fixed(
+    frame_prev: npt.NDArray[np.uint8], frame_curr: npt.NDArray[np.uint8]
+) -> Tuple[npt.NDArray[np.int16], npt.NDArray[np.int16], npt.NDArray[np.int16]]:
+    """
+    Compute the same gradients as compute_gradients in int16 fixed point for uint8 frames.
 
-    return Ix, Iy, It
+    The frame sum (twice the average) and its unnormalized Sobel response are exact
+    integers, so Ix and Iy come out in units of 1/16 (GRADIENT_FIXED_SCALE) and It in
+    whole gray levels. Every value fits in int16 (|Ix|, |Iy| <= 2040, |It| <= 255).
+
+    Args:
+        frame_prev: Previous frame (grayscale, uint8)
+        frame_curr: Current frame (grayscale, uint8)
+
+    Returns:
+        Tuple of (Ix, Iy, It) int16 gradient arrays
+    """
+    frame_sum = cv2.add(frame_prev, frame_curr, dtype=cv2.CV_16S)
+
+    # Same sign convention as compute_gradients (true convolution)
+    Ix = cv2.Sobel(frame_sum, cv2.CV_16S, 1, 0, ksize=3, scale=-1, borderType=cv2.BORDER_REFLECT)
+    Iy = cv2.Sobel(frame_sum, cv2.CV_16S, 0, 1, ksize=3, scale=-1, borderType=cv2.BORDER_REFLECT)
+    It = cv2.subtract(frame_prev, frame_curr, dtype=cv2.CV_16S)
+
+    return (
+        Ix.astype(np.int16, copy=False),
+        Iy.astype(np.int16, copy=False),
+        It.astype(np.int16, copy=False),
+    )
 
 
 def lucas_kanade_single_scale(
-    frame_prev: npt.NDArray[np.float32],
-    frame_curr: npt.NDArray[np.float32],
+    frame_prev: npt.NDArray[Any],
+    frame_curr: npt.NDArray[Any],
     window_size: int = 5,
+    out_u: Optional[npt.NDArray[np.float32]] = None,
+    out_v: Optional[npt.NDArray[np.float32]] = None,
 ) -> Tuple[npt.NDArray[np.float32], npt.NDArray[np.float32]]:
     """
     Compute optical flow using Lucas-Kanade method (single scale).
 
+    uint8 frames take the int16 fixed-point gradient path (half the memory traffic in the
+    window sums, same result); anything else uses float32 gradients.
+
     Args:
-        frame_prev: Previous frame (grayscale, float32)
-        frame_curr: Current frame (grayscale, float32)
+        frame_prev: Previous frame (grayscale, float32 or uint8)
+        frame_curr: Current frame (grayscale, float32 or uint8)
         window_size: Size of analysis window (must be odd)
+        out_u: Optional C-contiguous float32 buffer (frame shape) to write u into
+        out_v: Optional C-contiguous float32 buffer (frame shape) to write v into
 
     Returns:
-        Tuple of (u, v) flow fields
+        Tuple of (u, v) flow fields (out_u / out_v when given)
     """
+    if frame_prev.dtype == np.uint8 and frame_curr.dtype == np.uint8:
+        Ix16, Iy16, It16 = compute_gradients_fixed(frame_prev, frame_curr)
+        return lucas_kanade_from_gradients(
+            Ix16,
+            Iy16,
+            It16,
+            window_size,
+            gradient_scale=GRADIENT_FIXED_SCALE,
+            out_u=out_u,
+            out_v=out_v,
+        )
+
     # Compute gradients
     Ix, Iy, It = compute_gradients(frame_prev, frame_curr)
 
     # Compute flow from gradients
-    u, v = lucas_kanade_from_gradients(Ix, Iy, It, window_size)
+    u, v = lucas_kanade_from_gradients(Ix, Iy, It, window_size, out_u=out_u, out_v=out_v)
 
     return u, v
 
 
 def lucas_kanade_from_gradients(
-    Ix: npt.NDArray[np.float32],
-    Iy: npt.NDArray[np.float32],
-    It: npt.NDArray[np.float32],
+    Ix: npt.NDArray[Any],
+    Iy: npt.NDArray[Any],
+    It: npt.NDArray[Any],
     window_size: int = 5,
+    gradient_scale: float = 1.0,
+    out_u: Optional[npt.NDArray[np.float32]] = None,
+    out_v: Optional[npt.NDArray[np.float32]] = None,
 ) -> Tuple[npt.NDArray[np.float32], npt.NDArray[np.float32]]:
     """
     Compute optical flow from pre-computed gradients using least-squares.
@@ -89,47 +383,69 @@ def lucas_kanade_from_gradients(
     or when gradients are provided externally (e.g., warped frames in pyramidal LK).
 
     Args:
-        Ix: Spatial gradient in X direction
-        Iy: Spatial gradient in Y direction
-        It: Temporal gradient
+        Ix: Spatial gradient in X direction (float32, or int16 fixed point)
+        Iy: Spatial gradient in Y direction (float32, or int16 fixed point)
+        It: Temporal gradient (float32, or int16 fixed point)
         window_size: Size of analysis window (must be odd)
+        gradient_scale: Value of one Ix/Iy unit, e.g. GRADIENT_FIXED_SCALE for
+            compute_gradients_fixed output (It is always in gray levels)
+        out_u: Optional C-contiguous float32 buffer (gradient shape) to write u into
+        out_v: Optional C-contiguous float32 buffer (gradient shape) to write v into
 
     Returns:
-        Tuple of (u, v) flow fields
+        Tuple of (u, v) flow fields (out_u / out_v when given)
     """
+    fixed_point = Ix.dtype == np.int16 and Iy.dtype == np.int16 and It.dtype == np.int16
+    grad_dtype = np.int16 if fixed_point else np.float32
+
+    # Every pixel of the outputs is written (borders zeroed), so fresh ones need no memset
     height, width = Ix.shape
-    u = np.zeros((height, width), dtype=np.float32)
-    v = np.zeros((height, width), dtype=np.float32)
+    u = np.empty((height, width), dtype=np.float32) if out_u is None else out_u
+    v = np.empty((height, width), dtype=np.float32) if out_v is None else out_v
+
+    if NUMBA_AVAILABLE:
+        Ix = np.ascontiguousarray(Ix, dtype=grad_dtype)
+        Iy = np.ascontiguousarray(Iy, dtype=grad_dtype)
+        It = np.ascontiguousarray(It, dtype=grad_dtype)
+        if window_size == 5:
+            _lk5(Ix, Iy, It, gradient_scale, u, v)
+        else:
+            _lk_kernel(Ix, Iy, It, window_size, gradient_scale, u, v)
+        return u, v
+
+    # int16 gradients are small enough that float32 products and table sums stay exact
+    Ix = Ix.astype(np.float32, copy=False)
+    Iy = Iy.astype(np.float32, copy=False)
+    It = It.astype(np.float32, copy=False)
 
     half_win = window_size // 2
 
-    # Process each pixel (excluding borders)
-    for y in range(half_win, height - half_win):
-        for x in range(half_win, width - half_win):
-            # Extract window
-            win_Ix = Ix[y - half_win : y + half_win + 1, x - half_win : x + half_win + 1]
-            win_Iy = Iy[y - half_win : y + half_win + 1, x - half_win : x + half_win + 1]
-            win_It = It[y - half_win : y + half_win + 1, x - half_win : x + half_win + 1]
-
-            # Compute sums for least squares (structure tensor)
-            sum_Ix2 = np.sum(win_Ix * win_Ix)
-            sum_Iy2 = np.sum(win_Iy * win_Iy)
-            sum_IxIy = np.sum(win_Ix * win_Iy)
-            sum_IxIt = np.sum(win_Ix * win_It)
-            sum_IyIt = np.sum(win_Iy * win_It)
-
-            # Structure tensor (A^T * A)
-            A = np.array([[sum_Ix2, sum_IxIy], [sum_IxIy, sum_Iy2]], dtype=np.float32)
-
-            # Right-hand side (-A^T * b)
-            b = np.array([-sum_IxIt, -sum_IyIt], dtype=np.float32)
-
-            # Solve system (with regularization for stability)
-            det = A[0, 0] * A[1, 1] - A[0, 1] * A[1, 0]
-
-            # Compute flow where there's sufficient texture
-            if abs(det) > 1e-4:
-                u[y, x] = (A[1, 1] * b[0] - A[0, 1] * b[1]) / det
-                v[y, x] = (A[0, 0] * b[1] - A[0, 1] * b[0]) / det
+    # Per-pixel gradient products, summed over the window (structure tensor terms). Sums
+    # cover only the interior pixels that have a full window
+    sum_Ix2 = _window_sum(Ix * Ix, window_size)
+    sum_Iy2 = _window_sum(Iy * Iy, window_size)
+    sum_IxIy = _window_sum(Ix * Iy, window_size)
+    sum_IxIt = _window_sum(Ix * It, window_size)
+    sum_IyIt = _window_sum(Iy * It, window_size)
+
+    # Determinant of A = [[sum_Ix2, sum_IxIy], [sum_IxIy, sum_Iy2]]
+    det = sum_Ix2 * sum_Iy2 - sum_IxIy * sum_IxIy
+
+    # Compute flow where there's sufficient texture. Sums are in gradient units: det scales
+    # by gradient_scale^4, u/v by 1/gradient_scale
+    valid = np.abs(det) > 1e-4 / gradient_scale**4
+
+    # Cramer's rule with b = [-sum_IxIt, -sum_IyIt], one reciprocal shared by u and v
+    inv_det = np.divide(1.0, det * gradient_scale, out=np.zeros_like(det), where=valid)
+
+    # Interior assigned in one shot; only the border strips need zeroing
+    for flow in (u, v):
+        flow[:half_win] = 0.0
+        flow[height - half_win :] = 0.0
+        flow[:, :half_win] = 0.0
+        flow[:, width - half_win :] = 0.0
+    interior = (slice(half_win, height - half_win), slice(half_win, width - half_win))
+    u[interior] = (sum_IxIy * sum_IyIt - sum_Iy2 * sum_IxIt) * inv_det
+    v[interior] = (sum_IxIy * sum_IxIt - sum_Ix2 * sum_IyIt) * inv_det
 
     return u, v
@@ -6,22 +6,276 @@ Coarse-to-fine refinement for handling larger displacements.
 """
 
 import argparse
+import functools
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Tuple
+from typing import Any, Optional, Tuple
 
+import cv2
 import numpy as np
 import numpy.typing as npt
 from lucas_kanade_core import lucas_kanade_single_scale
-from scipy.ndimage import map_coordinates
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 PROJECT_ROOT = SCRIPT_DIR.parent
 DEFAULT_FRAME_DIR = PROJECT_ROOT / "tb" / "test_frames"
 
 
+if NUMBA_AVAILABLE:
+
+    @njit(parallel=True, cache=True)
+    def _bilinear_kernel(image: Any, y: Any, x: Any, out: Any) -> None:
+        """
+        Fused bilinear sampler: index math, four gathers and blend in one pass, rows in parallel.
+
+        Same float64 arithmetic as the NumPy path, so results are identical (no fastmath:
+        it would contract the blend into FMAs and drop the NaN-safe bounds test). Output is
+        walked row-major on purpose: coordinates are streamed in order and the gathers of
+        neighbouring outputs stay local, whereas 64x64 tiles in Morton order measured ~2x
+        slower at 1080p and 4K.
+
+        Args:
+            image: Image to sample (2-D)
+            y: Row coordinates, shaped like out (broadcast views are fine)
+            x: Column coordinates, shaped like out
+            out: Output array, written in full (zero outside the image)
+        """
+        height, width = image.shape
+        out_height, out_width = out.shape
+        y0_max = max(height - 2, 0)
+        x0_max = max(width - 2, 0)
+
+        for i in prange(out_height):
+            for j in range(out_width):
+                yi = y[i, j]
+                xi = x[i, j]
+                if not (0.0 <= yi <= height - 1 and 0.0 <= xi <= width - 1):
+                    out[i, j] = 0.0
+                    continue
+
+                y0 = min(int(np.floor(yi)), y0_max)
+                x0 = min(int(np.floor(xi)), x0_max)
+                y1 = min(y0 + 1, height - 1)
+                x1 = min(x0 + 1, width - 1)
+                wy = yi - y0
+                wx = xi - x0
+
+                top = (1.0 - wx) * image[y0, x0] + wx * image[y0, x1]
+                bottom = (1.0 - wx) * image[y1, x0] + wx * image[y1, x1]
+                out[i, j] = (1.0 - wy) * top + wy * bottom
+
+    @njit(nogil=True, cache=True)
+    def _resample_kernel(
+        image: Any, y0: Any, y1: Any, wy: Any, x0: Any, x1: Any, wx: Any, scale: Any, out: Any
+    ) -> None:
+        """
+        Separable bilinear resize from per-axis lookup tables.
+
+        Each referenced source row is interpolated horizontally once into a float64 row
+        buffer, then output rows are contiguous blends of two buffered rows. Same
+        arithmetic as blending four gathers per pixel (bit-identical), with half the
+        gathers when upsampling. Values are rounded to float32 and then multiplied by
+        scale (a float32), so flow rescaling costs no separate pass.
+
+        Single-threaded and releases the GIL: pyramid builds call it from two Python
+        threads at once, which a parallel kernel must not be (Numba's workqueue layer).
+        """
+        out_height, out_width = out.shape
+        rows = np.empty((image.shape[0], out_width), dtype=np.float64)
+        needed = np.zeros(image.shape[0], dtype=np.bool_)
+        for i in range(out_height):
+            needed[y0[i]] = True
+            needed[y1[i]] = True
+
+        for r in range(image.shape[0]):
+            if needed[r]:
+                for j in range(out_width):
+                    rows[r, j] = (1.0 - wx[j]) * image[r, x0[j]] + wx[j] * image[r, x1[j]]
+
+        for i in range(out_height):
+            top = rows[y0[i]]
+            bottom = rows[y1[i]]
+            for j in range(out_width):
+                out[i, j] = np.float32((1.0 - wy[i]) * top[j] + wy[i] * bottom[j]) * scale
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _accumulate_kernel(flow_u: Any, flow_v: Any, du: Any, dv: Any) -> Tuple[float, float]:
+        """Add the residual to the flow and sum |du|, |dv| in the same pass, rows in parallel."""
+        height, width = du.shape
+        sum_du = 0.0
+        sum_dv = 0.0
+        for i in prange(height):
+            for j in range(width):
+                flow_u[i, j] += du[i, j]
+                flow_v[i, j] += dv[i, j]
+                sum_du += abs(du[i, j])
+                sum_dv += abs(dv[i, j])
+        return sum_du, sum_dv
+
+
+def _accumulate_residual(
+    flow_u: npt.NDArray[np.float32],
+    flow_v: npt.NDArray[np.float32],
+    du: npt.NDArray[np.float32],
+    dv: npt.NDArray[np.float32],
+) -> Tuple[float, float]:
+    """
+    Add a residual flow estimate to the accumulated flow (in place).
+
+    Args:
+        flow_u: Accumulated horizontal flow (updated in place)
+        flow_v: Accumulated vertical flow (updated in place)
+        du: Horizontal residual (may be overwritten)
+        dv: Vertical residual (may be overwritten)
+
+    Returns:
+        Tuple of (mean |du|, mean |dv|)
+    """
+    if NUMBA_AVAILABLE:
+        sum_du, sum_dv = _accumulate_kernel(flow_u, flow_v, du, dv)
+        return sum_du / du.size, sum_dv / dv.size
+
+    flow_u += du
+    flow_v += dv
+    # The residuals aren't needed after accumulation, so take |.| in place (no temporaries)
+    return float(np.abs(du, out=du).mean()), float(np.abs(dv, out=dv).mean())
+
+
+def _bilinear_sample(
+    image: npt.NDArray[np.float32],
+    y: npt.NDArray[np.floating[Any]],
+    x: npt.NDArray[np.floating[Any]],
+    out: Optional[npt.NDArray[np.float32]] = None,
+) -> npt.NDArray[np.float32]:
+    """
+    Sample image at (y, x) with bilinear interpolation, zero outside the image.
+
+    Same result as map_coordinates(image, [y, x], order=1, mode="constant") - points
+    beyond [0, size - 1] on either axis are zero - without scipy's general N-D spline
+    setup. y and x only need to broadcast against each other, so separable grids can be
+    passed as a column and a row.
+
+    Args:
+        image: Image to sample (grayscale, float32)
+        y: Row coordinates
+        x: Column coordinates
+        out: Optional float32 buffer (broadcast shape of y and x) to write into
+
+    Returns:
+        Sampled values (float32), shaped like the broadcast of y and x
+    """
+    if NUMBA_AVAILABLE:
+        shape = np.broadcast_shapes(y.shape, x.shape)
+        y = np.broadcast_to(y, shape)
+        x = np.broadcast_to(x, shape)
+        if out is None:
+            out = np.empty(shape, dtype=np.float32)
+        _bilinear_kernel(image, y, x, out)
+        return out
+
+    height, width = image.shape
+    valid = (y >= 0) & (y <= height - 1) & (x >= 0) & (x <= width - 1)
+
+    # Top-left corner, kept off the last row/column so the bottom-right corner exists
+    # (a point on the last row/column gets full weight from the far corner)
+    y0 = np.clip(np.floor(y), 0, max(height - 2, 0)).astype(np.intp)
+    x0 = np.clip(np.floor(x), 0, max(width - 2, 0)).astype(np.intp)
+    y1 = np.minimum(y0 + 1, height - 1)
+    x1 = np.minimum(x0 + 1, width - 1)
+    wy = y - y0
+    wx = x - x0
+
+    top = (1.0 - wx) * image[y0, x0] + wx * image[y0, x1]
+    bottom = (1.0 - wx) * image[y1, x0] + wx * image[y1, x1]
+    sampled = np.where(valid, (1.0 - wy) * top + wy * bottom, 0.0)
+    if out is None:
+        return sampled.astype(np.float32)
+    out[...] = sampled
+    return out
+
+
+@functools.lru_cache(maxsize=16)
+def _resample_table(
+    src_size: int, dst_size: int, half_pitch: bool = False
+) -> Tuple[npt.NDArray[np.intp], npt.NDArray[np.intp], npt.NDArray[np.float64]]:
+    """
+    Bilinear lookup table for resizing one axis from src_size to dst_size.
+
+    The grid is corner-aligned (first/last positions map onto each other), or with
+    half_pitch, output position x samples source position x / 2 (the grid of a
+    cv2.pyrDown level, whose sample i sits on fine pixel 2i), clamped to the last sample.
+
+    Cached per size pair (pyramid and upsampling sizes repeat every frame); read-only.
+
+    Returns:
+        Tuple of (first source index, second source index, weight of the second) for
+        every output position
+    """
+    if half_pitch:
+        grid = np.minimum(np.arange(dst_size) * 0.5, src_size - 1)
+    else:
+        grid = np.linspace(0, src_size - 1, dst_size)
+    index0 = np.clip(np.floor(grid), 0, max(src_size - 2, 0)).astype(np.intp)
+    index1 = np.minimum(index0 + 1, src_size - 1)
+    weight = grid - index0
+    for table in (index0, index1, weight):
+        table.flags.writeable = False
+    return index0, index1, weight
+
+
+def _resample(
+    image: npt.NDArray[np.float32],
+    target_shape: Tuple[int, int],
+    scale: float = 1.0,
+    half_pitch: bool = False,
+) -> npt.NDArray[np.float32]:
+    """
+    Resize image bilinearly on corner-aligned grids (first/last pixels map onto each other),
+    or on the 2x pyrDown sample pitch with half_pitch.
+
+    Same values as _bilinear_sample on the two linspace grids, but the indices and weights
+    come from cached per-axis tables, so there is no floor/clip/bounds test per pixel, and
+    the interpolation runs as a horizontal pass followed by a vertical one.
+
+    Args:
+        image: Image to resize (grayscale, float32)
+        target_shape: (height, width) of the output
+        scale: Factor applied to the resized values in float32 (e.g. flow magnitudes)
+        half_pitch: Sample source position x / 2 instead (see _resample_table)
+
+    Returns:
+        Resized image (float32)
+    """
+    y0, y1, wy = _resample_table(image.shape[0], target_shape[0], half_pitch)
+    x0, x1, wx = _resample_table(image.shape[1], target_shape[1], half_pitch)
+
+    if NUMBA_AVAILABLE:
+        out = np.empty(target_shape, dtype=np.float32)
+        _resample_kernel(image, y0, y1, wy, x0, x1, wx, np.float32(scale), out)
+        return out
+
+    # Horizontal pass once per source row, then blend pairs of rows vertically
+    rows = (1.0 - wx) * image[:, x0] + wx * image[:, x1]
+    wy = wy[:, np.newaxis]
+    resized: npt.NDArray[np.float32] = ((1.0 - wy) * rows[y0] + wy * rows[y1]).astype(np.float32)
+    if scale != 1.0:
+        resized *= np.float32(scale)
+    return resized
+
+
 def build_gaussian_pyramid(
-    image: npt.NDArray[np.float32], num_levels: int, scale_factor: float = 0.5
+    image: npt.NDArray[np.float32],
+    num_levels: int,
+    scale_factor: float = 0.5,
+    downsample: str = "gaussian",
 ) -> list[npt.NDArray[np.float32]]:
     """
     Build Gaussian pyramid by iterative smoothing and downsampling.
@@ -30,21 +284,37 @@ def build_gaussian_pyramid(
         image: Input image (grayscale, float32)
         num_levels: Number of pyramid levels (1 = original only)
         scale_factor: Downsampling factor between levels (default 0.5 = half resolution)
+        downsample: "gaussian" (blur with sigma = 1/scale_factor, then corner-aligned
+            bilinear resample) or "pyrdown" (cv2.pyrDown: 5-tap binomial filter evaluated
+            only at the kept pixels; requires scale_factor 0.5)
 
     Returns:
         List of images from coarse (smallest) to fine (original)
     """
-    from scipy.ndimage import gaussian_filter
+    if downsample not in ("gaussian", "pyrdown"):
+        raise ValueError(f"Unknown pyramid downsample method: {downsample}")
+    if downsample == "pyrdown" and scale_factor != 0.5:
+        raise ValueError("pyrdown downsampling requires scale_factor=0.5")
 
     pyramid: list[npt.NDArray[np.float32]] = []
     current = image.copy()
 
     # Build from fine to coarse
     for level in range(num_levels):
-        if level > 0:
-            # Smooth before downsampling (anti-aliasing)
+        if level > 0 and downsample == "pyrdown":
+            # Filter and decimate in one pass, no full-resolution smoothed intermediate
+            height, width = current.shape
+            current = cv2.pyrDown(current, dstsize=(width // 2, height // 2)).astype(
+                np.float32, copy=False
+            )
+        elif level > 0:
+            # Smooth before downsampling (anti-aliasing). Kernel radius and reflect border
+            # match scipy's gaussian_filter (truncate=4.0, mode="reflect")
             sigma = 1.0 / scale_factor
-            smoothed = gaussian_filter(current, sigma=sigma)
+            ksize = 2 * int(4.0 * sigma + 0.5) + 1
+            smoothed = cv2.GaussianBlur(
+                current, (ksize, ksize), sigma, borderType=cv2.BORDER_REFLECT
+            ).astype(np.float32, copy=False)
 
             # Downsample
             height, width = smoothed.shape
@@ -52,21 +322,20 @@ def build_gaussian_pyramid(
             new_width = int(width * scale_factor)
 
             # Use bilinear interpolation for downsampling
-            y_coords = np.linspace(0, height - 1, new_height)
-            x_coords = np.linspace(0, width - 1, new_width)
-            yy, xx = np.meshgrid(y_coords, x_coords, indexing="ij")
+            current = _resample(smoothed, (new_height, new_width))
 
-            current = map_coordinates(smoothed, [yy, xx], order=1, mode="constant")
+        pyramid.append(current)
 
-        pyramid.insert(0, current)  # Insert at beginning (coarse to fine)
-
-    return pyramid
+    # Built fine to coarse; callers expect coarse to fine
+    return pyramid[::-1]
 
 
 def warp_image(
     image: npt.NDArray[np.float32],
     flow_u: npt.NDArray[np.float32],
     flow_v: npt.NDArray[np.float32],
+    out: Optional[npt.NDArray[np.float32]] = None,
+    coord_buffers: Optional[Tuple[npt.NDArray[np.float32], npt.NDArray[np.float32]]] = None,
 ) -> npt.NDArray[np.float32]:
     """
     Warp image according to flow field using bilinear interpolation.
@@ -78,29 +347,37 @@ def warp_image(
         image: Image to warp (grayscale, float32)
         flow_u: Horizontal flow component
         flow_v: Vertical flow component
+        out: Optional float32 buffer (image shape) reused for the result
+        coord_buffers: Optional (x, y) float32 buffers (image shape) reused for the
+            warped coordinates
 
     Returns:
         Warped image
     """
     height, width = image.shape
 
-    # Create coordinate grids
-    yy, xx = np.meshgrid(np.arange(height), np.arange(width), indexing="ij")
-
-    # Compute warped coordinates (add flow to move pixels forward)
-    x_warped = xx + flow_u
-    y_warped = yy + flow_v
+    # Compute warped coordinates (add flow to move pixels forward); the pixel grid
+    # broadcasts as a column / row instead of being materialized with meshgrid. float32
+    # like the flow itself (spacing <= 1/16384 px below 1024), half the traffic of float64
+    cols = np.arange(width, dtype=np.float32)
+    rows = np.arange(height, dtype=np.float32)[:, np.newaxis]
+    if coord_buffers is None:
+        x_warped = cols + flow_u
+        y_warped = rows + flow_v
+    else:
+        x_warped, y_warped = coord_buffers
+        np.add(cols, flow_u, out=x_warped)
+        np.add(rows, flow_v, out=y_warped)
 
     # Bilinear interpolation
-    warped_any = map_coordinates(image, [y_warped, x_warped], order=1, mode="constant", cval=0.0)
-    warped: npt.NDArray[np.float32] = warped_any.astype(np.float32)
-    return warped
+    return _bilinear_sample(image, y_warped, x_warped, out)
 
 
 def upsample_flow(
     flow_u: npt.NDArray[np.float32],
     flow_v: npt.NDArray[np.float32],
     target_shape: Tuple[int, int],
+    downsample: str = "gaussian",
 ) -> Tuple[npt.NDArray[np.float32], npt.NDArray[np.float32]]:
     """
     Upsample flow field to target resolution.
@@ -111,6 +388,8 @@ def upsample_flow(
         flow_u: Coarse horizontal flow
         flow_v: Coarse vertical flow
         target_shape: (height, width) of desired output
+        downsample: How the coarse level was built (see build_gaussian_pyramid). pyrdown
+            levels are upsampled on their own 2x sample pitch instead of corner-aligned
 
     Returns:
         Tuple of upsampled (u, v) flow fields
@@ -118,24 +397,25 @@ def upsample_flow(
     coarse_height, coarse_width = flow_u.shape
     target_height, target_width = target_shape
 
-    # Scale factors
-    scale_y = target_height / coarse_height
-    scale_x = target_width / coarse_width
+    # Same resolution: identity resample with unit scale; copies since callers update the
+    # returned flow in place
+    if (coarse_height, coarse_width) == (target_height, target_width):
+        return flow_u.copy(), flow_v.copy()
 
-    # Create coordinate grids for target resolution
-    y_target = np.linspace(0, coarse_height - 1, target_height)
-    x_target = np.linspace(0, coarse_width - 1, target_width)
-    yy, xx = np.meshgrid(y_target, x_target, indexing="ij")
-
-    # Bilinear interpolation
-    flow_u_upsampled = map_coordinates(flow_u, [yy, xx], order=1, mode="constant")
-    flow_v_upsampled = map_coordinates(flow_v, [yy, xx], order=1, mode="constant")
+    # Scale factors (the sample pitch ratio; exactly 2 for pyrdown levels)
+    half_pitch = downsample == "pyrdown"
+    if half_pitch:
+        scale_y = scale_x = 2.0
+    else:
+        scale_y = target_height / coarse_height
+        scale_x = target_width / coarse_width
 
-    # Scale flow magnitudes (motion is proportional to resolution)
-    flow_u_upsampled = flow_u_upsampled * scale_x
-    flow_v_upsampled = flow_v_upsampled * scale_y
+    # Bilinear interpolation; flow magnitudes scale with the resolution (motion is
+    # proportional to it), applied in float32 by the same pass
+    flow_u_upsampled = _resample(flow_u, target_shape, scale_x, half_pitch)
+    flow_v_upsampled = _resample(flow_v, target_shape, scale_y, half_pitch)
 
-    return flow_u_upsampled.astype(np.float32), flow_v_upsampled.astype(np.float32)
+    return flow_u_upsampled, flow_v_upsampled
 
 
 def lucas_kanade_pyramidal(
@@ -144,6 +424,8 @@ def lucas_kanade_pyramidal(
     num_levels: int = 3,
     window_size: int = 5,
     num_iterations: int = 3,
+    downsample: str = "gaussian",
+    visualize: bool = True,
 ) -> Tuple[npt.NDArray[np.float32], npt.NDArray[np.float32]]:
     """
     Pyramidal Lucas-Kanade optical flow with coarse-to-fine refinement.
@@ -164,14 +446,23 @@ def lucas_kanade_pyramidal(
         num_levels: Number of pyramid levels
         window_size: Window size for Lucas-Kanade
         num_iterations: Iterations per pyramid level (for further refinement)
+        downsample: Pyramid downsampling method ("gaussian" or "pyrdown"),
+            see build_gaussian_pyramid
+        visualize: Save a flow plot per pyramid level (disable for timed runs)
 
     Returns:
         Tuple of (u, v) flow fields at original resolution
     """
     # Build pyramids (coarse to fine)
     print(f"Building {num_levels}-level Gaussian pyramids...")
-    pyr_prev = build_gaussian_pyramid(frame_prev, num_levels)
-    pyr_curr = build_gaussian_pyramid(frame_curr, num_levels)
+    # The two builds are independent and their OpenCV / Numba kernels release the GIL, so
+    # overlap them on two threads (on a single core the pool would only add overhead)
+    build = functools.partial(build_gaussian_pyramid, num_levels=num_levels, downsample=downsample)
+    if (os.cpu_count() or 1) > 1:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            pyr_prev, pyr_curr = executor.map(build, (frame_prev, frame_curr))
+    else:
+        pyr_prev, pyr_curr = build(frame_prev), build(frame_curr)
 
     # Verify pyramid shapes
     print("Pyramid levels:")
@@ -183,6 +474,11 @@ def lucas_kanade_pyramidal(
     flow_u = np.zeros((height, width), dtype=np.float32)
     flow_v = np.zeros((height, width), dtype=np.float32)
 
+    # Per-level plots are rendered on one background thread from copies of the flow, so
+    # matplotlib overlaps the refinement of the next level instead of stalling it
+    plot_executor = ThreadPoolExecutor(max_workers=1) if visualize else None
+    plot_futures = []
+
     # Coarse-to-fine refinement
     for level in range(num_levels):
         print(f"\nProcessing pyramid level {level}/{num_levels-1}...")
@@ -194,24 +490,24 @@ def lucas_kanade_pyramidal(
         # Upsample flow from previous level (if not at coarsest)
         if level > 0:
             target_shape = img_prev.shape
-            flow_u, flow_v = upsample_flow(flow_u, flow_v, target_shape)
+            flow_u, flow_v = upsample_flow(flow_u, flow_v, target_shape, downsample)
             print(f"  Upsampled flow to {target_shape[1]}x{target_shape[0]}")
 
-        # Iterative refinement at this level
+        # Iterative refinement at this level (warp output, coordinate and residual buffers
+        # are allocated once per level and reused by every iteration)
+        img_warped = np.empty_like(img_curr)
+        coord_buffers = (np.empty_like(img_curr), np.empty_like(img_curr))
+        du = np.empty_like(flow_u)
+        dv = np.empty_like(flow_v)
         for iteration in range(num_iterations):
             # Warp current frame using current flow estimate
-            img_warped = warp_image(img_curr, flow_u, flow_v)
+            warp_image(img_curr, flow_u, flow_v, out=img_warped, coord_buffers=coord_buffers)
 
             # Compute residual flow (between prev and warped current)
-            du, dv = lucas_kanade_single_scale(img_prev, img_warped, window_size)
-
-            # Accumulate flow
-            flow_u += du
-            flow_v += dv
+            lucas_kanade_single_scale(img_prev, img_warped, window_size, out_u=du, out_v=dv)
 
-            # Statistics
-            mean_du = np.mean(np.abs(du))
-            mean_dv = np.mean(np.abs(dv))
+            # Accumulate flow; residual statistics come from the same pass
+            mean_du, mean_dv = _accumulate_residual(flow_u, flow_v, du, dv)
             print(
                 f"  Iteration {iteration+1}/{num_iterations}: "
                 f"mean residual = ({mean_du:.4f}, {mean_dv:.4f})"
@@ -223,7 +519,17 @@ def lucas_kanade_pyramidal(
                 break
 
         # Save visualization
-        visualize_pyramid_level(flow_u, flow_v, level, num_levels)
+        if plot_executor is not None:
+            plot_futures.append(
+                plot_executor.submit(
+                    visualize_pyramid_level, flow_u.copy(), flow_v.copy(), level, num_levels
+                )
+            )
+
+    if plot_executor is not None:
+        plot_executor.shutdown()
+        for future in plot_futures:
+            future.result()
 
     return flow_u, flow_v
 
@@ -247,7 +553,7 @@ def visualize_flow_comparison(
         output_path: Where to save visualization
         scale: Arrow scale factor
     """
-    import matplotlib.pyplot as plt
+    from matplotlib.figure import Figure
 
     height, width = flow_u_single.shape
 
@@ -255,7 +561,8 @@ def visualize_flow_comparison(
     step = 10
     y_coords, x_coords = np.mgrid[step:height:step, step:width:step]
 
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(20, 9))
+    fig = Figure(figsize=(20, 9))
+    ax1, ax2 = fig.subplots(1, 2)
 
     # Single-scale
     u_sub = flow_u_single[step:height:step, step:width:step]
@@ -305,8 +612,8 @@ def visualize_flow_comparison(
     ax2.set_xlabel("X (pixels)")
     ax2.set_ylabel("Y (pixels)")
 
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=100)
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=100)
     print(f"Comparison visualization saved: {output_path}")
 
 
@@ -317,38 +624,43 @@ def visualize_pyramid_level(
     num_levels: int = 3,
     output_dir: str = "python/output",
 ) -> None:
-    """Visualize flow field at a specific pyramid level."""
-    import matplotlib.pyplot as plt
+    """
+    Visualize flow field at a specific pyramid level.
+
+    Uses the object-oriented Figure API (Agg canvas, no pyplot state) so it is safe to call
+    from the background plotting thread in lucas_kanade_pyramidal.
+    """
     from matplotlib.colors import Normalize
+    from matplotlib.figure import Figure
 
     os.makedirs(output_dir, exist_ok=True)
 
     # Compute flow magnitude for color coding
     magnitude = np.sqrt(flow_u**2 + flow_v**2)
 
-    fig, axes = plt.subplots(1, 3, figsize=(15, 4))
+    fig = Figure(figsize=(15, 4))
+    axes = fig.subplots(1, 3)
 
     # U component
     im0 = axes[0].imshow(flow_u, cmap="RdBu_r", norm=Normalize(vmin=-20, vmax=20))
     axes[0].set_title(f"Level {level}: U (horizontal)")
     axes[0].axis("off")
-    plt.colorbar(im0, ax=axes[0], label="pixels")
+    fig.colorbar(im0, ax=axes[0], label="pixels")
 
     # V component
     im1 = axes[1].imshow(flow_v, cmap="RdBu_r", norm=Normalize(vmin=-20, vmax=20))
     axes[1].set_title(f"Level {level}: V (vertical)")
     axes[1].axis("off")
-    plt.colorbar(im1, ax=axes[1], label="pixels")
+    fig.colorbar(im1, ax=axes[1], label="pixels")
 
     # Magnitude
     im2 = axes[2].imshow(magnitude, cmap="viridis", norm=Normalize(vmin=0, vmax=20))
     axes[2].set_title(f"Level {level}: Magnitude")
     axes[2].axis("off")
-    plt.colorbar(im2, ax=axes[2], label="pixels")
+    fig.colorbar(im2, ax=axes[2], label="pixels")
 
-    plt.tight_layout()
-    plt.savefig(f"{output_dir}/pyramid_level_{level}.png", dpi=100, bbox_inches="tight")
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(f"{output_dir}/pyramid_level_{level}.png", dpi=100, bbox_inches="tight")
 
 
 def main() -> None:
@@ -376,6 +688,11 @@ def main() -> None:
         action="store_true",
         help="Compare with single-scale implementation",
     )
+    parser.add_argument(
+        "--no-viz",
+        action="store_true",
+        help="Skip plot generation (for timing runs)",
+    )
 
     args = parser.parse_args()
 
@@ -413,6 +730,7 @@ def main() -> None:
         num_levels=args.num_levels,
         window_size=args.window_size,
         num_iterations=args.num_iterations,
+        visualize=not args.no_viz,
     )
 
     # Analyze results
@@ -442,7 +760,9 @@ def main() -> None:
         from lucas_kanade_core import lucas_kanade_single_scale
 
         u_single, v_single = lucas_kanade_single_scale(
-            frame_prev, frame_curr, window_size=args.window_size
+            frame_prev_u8.reshape((args.height, args.width)),
+            frame_curr_u8.reshape((args.height, args.width)),
+            window_size=args.window_size,
         )
 
         u_mean_single = np.mean(u_single[test_region])
@@ -459,16 +779,17 @@ def main() -> None:
         )
 
         # Visualize comparison
-        try:
-            visualize_flow_comparison(
-                u_single,
-                v_single,
-                u_pyr,
-                v_pyr,
-                output_dir / "flow_comparison.png",
-            )
-        except ImportError:
-            print("Matplotlib not available, skipping visualization")
+        if not args.no_viz:
+            try:
+                visualize_flow_comparison(
+                    u_single,
+                    v_single,
+                    u_pyr,
+                    v_pyr,
+                    output_dir / "flow_comparison.png",
+                )
+            except ImportError:
+                print("Matplotlib not available, skipping visualization")
 
     print("\n" + "=" * 60)
     print("Complete!")
@@ -11,7 +11,11 @@ from typing import Optional
 
 import numpy as np
 import numpy.typing as npt
-from lucas_kanade_core import compute_gradients, lucas_kanade_single_scale
+from lucas_kanade_core import (
+    GRADIENT_FIXED_SCALE,
+    compute_gradients_fixed,
+    lucas_kanade_single_scale,
+)
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 PROJECT_ROOT = SCRIPT_DIR.parent
@@ -31,7 +35,7 @@ def visualize_flow(
         output_path: Where to save visualization
         scale: Arrow scale factor
     """
-    import matplotlib.pyplot as plt
+    from matplotlib.figure import Figure
 
     height, width = u.shape
 
@@ -43,7 +47,8 @@ def visualize_flow(
     v_sub = v[step:height:step, step:width:step]
 
     # Create figure
-    fig, ax = plt.subplots(figsize=(12, 9))
+    fig = Figure(figsize=(12, 9))
+    ax = fig.subplots()
 
     # Magnitude for color
     magnitude = np.sqrt(u_sub**2 + v_sub**2)
@@ -69,9 +74,9 @@ def visualize_flow(
     ax.set_xlabel("X (pixels)")
     ax.set_ylabel("Y (pixels)")
 
-    plt.colorbar(ax.collections[0], ax=ax, label="Flow Magnitude (pixels)")
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150)
+    fig.colorbar(ax.collections[0], ax=ax, label="Flow Magnitude (pixels)")
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=150)
     print(f"Flow visualization saved: {output_path}")
 
 
@@ -96,9 +101,11 @@ def export_flow_field_txt(
                 f"y[{test_region['y_min']}:{test_region['y_max']}]\n"
             )
 
-        for y_idx in range(height):
-            for x_idx in range(width):
-                f.write(f"{x_idx} {y_idx} {u[y_idx, x_idx]:.6f} {v[y_idx, x_idx]:.6f}\n")
+        # One %-format per line on plain Python numbers (tolist) instead of four numpy scalar
+        # formats; np.savetxt is no faster, it formats row by row in Python as well
+        y_coords, x_coords = np.divmod(np.arange(height * width), width)
+        rows = zip(x_coords.tolist(), y_coords.tolist(), u.ravel().tolist(), v.ravel().tolist())
+        f.write("".join(["%d %d %.6f %.6f\n" % row for row in rows]))
 
     print(f"Flow field text export: {output_path}")
 
@@ -121,6 +128,11 @@ def main() -> None:
         default=str(DEFAULT_OUTPUT_DIR),
         help="Output directory for results",
     )
+    parser.add_argument(
+        "--no-viz",
+        action="store_true",
+        help="Skip plot generation (for timing runs)",
+    )
 
     args = parser.parse_args()
 
@@ -133,24 +145,27 @@ def main() -> None:
     frame_prev_u8 = np.fromfile(frame_dir / "frame_00.bin", dtype=np.uint8)
     frame_curr_u8 = np.fromfile(frame_dir / "frame_01.bin", dtype=np.uint8)
 
-    frame_prev: npt.NDArray[np.float32] = frame_prev_u8.reshape((args.height, args.width)).astype(
-        np.float32
-    )
-    frame_curr: npt.NDArray[np.float32] = frame_curr_u8.reshape((args.height, args.width)).astype(
-        np.float32
-    )
+    # Kept as uint8: the core takes the int16 fixed-point gradient path for 8-bit frames
+    frame_prev = frame_prev_u8.reshape((args.height, args.width))
+    frame_curr = frame_curr_u8.reshape((args.height, args.width))
 
     print(f"Loaded frames: {args.width}x{args.height}")
     print(f"Window size: {args.window_size}x{args.window_size}")
 
     # Compute gradients (for debugging)
     print("\nComputing gradients...")
-    Ix, Iy, It = compute_gradients(frame_prev, frame_curr)
+    Ix, Iy, It = compute_gradients_fixed(frame_prev, frame_curr)
 
-    # Check gradient magnitudes
+    # Check gradient magnitudes (stays in int16; only the extrema are scaled to pixel units)
     print("\nGradient statistics:")
-    print(f"  Ix range: [{np.min(Ix):.2f}, {np.max(Ix):.2f}]")
-    print(f"  Iy range: [{np.min(Iy):.2f}, {np.max(Iy):.2f}]")
+    print(
+        f"  Ix range: [{np.min(Ix) * GRADIENT_FIXED_SCALE:.2f}, "
+        f"{np.max(Ix) * GRADIENT_FIXED_SCALE:.2f}]"
+    )
+    print(
+        f"  Iy range: [{np.min(Iy) * GRADIENT_FIXED_SCALE:.2f}, "
+        f"{np.max(Iy) * GRADIENT_FIXED_SCALE:.2f}]"
+    )
     print(f"  It range: [{np.min(It):.2f}, {np.max(It):.2f}]")
 
     # Compute optical flow using core algorithm
@@ -162,7 +177,7 @@ def main() -> None:
     half_win = args.window_size // 2
     valid_region = np.s_[half_win:-half_win, half_win:-half_win]
     total_valid_windows = (args.height - 2 * half_win) * (args.width - 2 * half_win)
-    computed_windows = np.sum(u[valid_region] != 0)
+    computed_windows = np.count_nonzero(u[valid_region])
 
     print(f"  Total possible windows: {total_valid_windows}")
     print(f"  Windows with non-zero flow: {computed_windows}")
@@ -198,10 +213,11 @@ def main() -> None:
     )
 
     # Visualize
-    try:
-        visualize_flow(u, v, output_dir / "flow_visualization_single_scale.png")
-    except ImportError:
-        print("Matplotlib not available, skipping visualization")
+    if not args.no_viz:
+        try:
+            visualize_flow(u, v, output_dir / "flow_visualization_single_scale.png")
+        except ImportError:
+            print("Matplotlib not available, skipping visualization")
 
 
 if __name__ == "__main__":
@@ -6,17 +6,24 @@ Runs Lucas-Kanade on test patterns and generates accuracy reports.
 """
 
 import argparse
-import json
+import contextlib
+import functools
+import io
+import multiprocessing
+import os
 import sys
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Tuple
 
+import cv2
 import numpy as np
 import numpy.typing as npt
 import yaml
 from flow_metrics import compute_all_metrics
-from lucas_kanade_core import lucas_kanade_single_scale
+from json_io import read_json, write_json
+from lucas_kanade_core import NUMBA_AVAILABLE, lucas_kanade_single_scale
 from lucas_kanade_pyramidal import lucas_kanade_pyramidal
 
 # ============================================================================
@@ -29,14 +36,24 @@ def load_config(config_path: Path) -> dict[str, Any]:
     with open(config_path, "r") as f:
         config = yaml.safe_load(f)
     assert isinstance(config, dict)
+    config["threshold_table"] = build_threshold_table(config)
     return config
 
 
+def build_threshold_table(config: dict[str, Any]) -> dict[str, tuple[float, float]]:
+    """Map each pattern name to its (pass_threshold, warning_threshold) pair."""
+    table: dict[str, tuple[float, float]] = {}
+    for category, patterns in config["pattern_categories"].items():
+        thresholds = config["thresholds"][category]
+        for pattern in patterns:
+            # First category listing a pattern wins, as in the original linear scan
+            table.setdefault(pattern, (thresholds["mae_pass"], thresholds["mae_warning"]))
+    return table
+
+
 def load_test_suite_index(suite_dir: Path) -> dict[str, Any]:
     """Load test suite index JSON."""
-    index_path = suite_dir / "suite_index.json"
-    with open(index_path, "r") as f:
-        index: dict[str, Any] = json.load(f)
+    index: dict[str, Any] = read_json(suite_dir / "suite_index.json")
     return index
 
 
@@ -46,23 +63,19 @@ def load_test_pattern(pattern_dir: Path) -> dict[str, Any]:
 
     Returns:
         Dictionary with keys:
-            - frame_prev: np.ndarray (float32, grayscale)
-            - frame_curr: np.ndarray (float32, grayscale)
+            - frame_prev: np.ndarray (uint8, grayscale)
+            - frame_curr: np.ndarray (uint8, grayscale)
             - metadata: dict from metadata.json
     """
     # Load metadata
-    with open(pattern_dir / "metadata.json", "r") as f:
-        metadata = json.load(f)
+    metadata = read_json(pattern_dir / "metadata.json")
 
-    # Load frames as uint8, convert to float32
+    # Load frames as uint8 (single-scale L-K differentiates them in fixed point directly)
     width = metadata["resolution"]["width"]
     height = metadata["resolution"]["height"]
 
-    frame_prev_u8 = np.fromfile(pattern_dir / "frame_00.bin", dtype=np.uint8)
-    frame_curr_u8 = np.fromfile(pattern_dir / "frame_01.bin", dtype=np.uint8)
-
-    frame_prev = frame_prev_u8.reshape((height, width)).astype(np.float32)
-    frame_curr = frame_curr_u8.reshape((height, width)).astype(np.float32)
+    frame_prev = np.fromfile(pattern_dir / "frame_00.bin", dtype=np.uint8).reshape((height, width))
+    frame_curr = np.fromfile(pattern_dir / "frame_01.bin", dtype=np.uint8).reshape((height, width))
 
     return {
         "frame_prev": frame_prev,
@@ -73,12 +86,12 @@ def load_test_pattern(pattern_dir: Path) -> dict[str, Any]:
 
 def get_thresholds_for_pattern(pattern_name: str, config: dict) -> tuple[float, float]:
     """Return (pass_threshold, warning_threshold) for pattern."""
-    # Find category
-    categories = config["pattern_categories"]
-    for category, patterns in categories.items():
-        if pattern_name in patterns:
-            thresholds = config["thresholds"][category]
-            return thresholds["mae_pass"], thresholds["mae_warning"]
+    table = config.get("threshold_table")
+    if table is None:
+        table = config["threshold_table"] = build_threshold_table(config)
+    if pattern_name in table:
+        thresholds: tuple[float, float] = table[pattern_name]
+        return thresholds
 
     # Default to translation if unknown
     print(f"Warning: Unknown pattern '{pattern_name}', using translation thresholds")
@@ -110,17 +123,25 @@ def get_test_region_mask(
         center_crop_size: Size of center crop for rotation/zoom patterns
 
     Returns:
-        Boolean mask (True = test this pixel)
+        Boolean mask (True = test this pixel), shared between calls and read-only
     """
-    height, width = shape
-    mask = np.zeros((height, width), dtype=bool)
-
     # Determine pattern category
     is_rotation = "rotate" in pattern_type
     is_zoom = "zoom" in pattern_type
     is_combined = "translate_rotate" in pattern_type
 
-    if is_rotation or is_zoom or is_combined:
+    return _region_mask(tuple(shape), is_rotation or is_zoom or is_combined, center_crop_size)
+
+
+@functools.lru_cache(maxsize=16)
+def _region_mask(
+    shape: Tuple[int, int], center_only: bool, center_crop_size: int
+) -> npt.NDArray[np.bool_]:
+    """Test region mask per (shape, category), cached: patterns of a category share it."""
+    height, width = shape
+    mask = np.zeros((height, width), dtype=bool)
+
+    if center_only:
         # Test only center region (variable flow elsewhere)
         cy, cx = height // 2, width // 2
         half_size = center_crop_size // 2
@@ -135,6 +156,7 @@ def get_test_region_mask(
         border = 10
         mask[border:-border, border:-border] = True
 
+    mask.flags.writeable = False
     return mask
 
 
@@ -144,8 +166,8 @@ def get_test_region_mask(
 
 
 def run_single_scale_lk(
-    frame_prev: npt.NDArray[np.float32],
-    frame_curr: npt.NDArray[np.float32],
+    frame_prev: npt.NDArray[np.uint8],
+    frame_curr: npt.NDArray[np.uint8],
     window_size: int,
 ) -> Tuple[npt.NDArray[np.float32], npt.NDArray[np.float32]]:
     """Run single-scale Lucas-Kanade."""
@@ -153,17 +175,21 @@ def run_single_scale_lk(
 
 
 def run_pyramidal_lk(
-    frame_prev: npt.NDArray[np.float32],
-    frame_curr: npt.NDArray[np.float32],
+    frame_prev: npt.NDArray[np.uint8],
+    frame_curr: npt.NDArray[np.uint8],
     pyramid_config: dict[str, Any],
+    visualize: bool = True,
 ) -> Tuple[npt.NDArray[np.float32], npt.NDArray[np.float32]]:
     """Run pyramidal Lucas-Kanade with specified configuration."""
+    # Pyramid levels are smoothed/resampled, so they need float frames
     return lucas_kanade_pyramidal(
-        frame_prev,
-        frame_curr,
+        frame_prev.astype(np.float32),
+        frame_curr.astype(np.float32),
         num_levels=pyramid_config["levels"],
         window_size=pyramid_config["window_size"],
         num_iterations=pyramid_config["iterations"],
+        downsample=pyramid_config.get("downsample", "gaussian"),
+        visualize=visualize,
     )
 
 
@@ -214,10 +240,16 @@ def verify_pattern(
     config: dict[str, Any],
     pyramid_config_name: str = "default",
     verbose: bool = True,
+    visualize: bool = True,
+    keep_flow: bool = False,
 ) -> dict[str, Any]:
     """
     Run verification on a single test pattern.
 
+    visualize controls the per-level pyramid plots written by lucas_kanade_pyramidal.
+    keep_flow adds the computed flow fields under "flow_fields" (u_single, v_single, u_pyr,
+    v_pyr) so callers can plot them without re-running L-K; pop it before saving results.
+
     Returns:
         Results dictionary with metrics and classification
     """
@@ -245,7 +277,7 @@ def verify_pattern(
         pattern_name,
         config["test_region"]["center_crop"],
     )
-    num_test_pixels = np.sum(mask)
+    num_test_pixels = np.count_nonzero(mask)
     if verbose:
         print(f"Test region: {num_test_pixels} pixels")
 
@@ -267,7 +299,7 @@ def verify_pattern(
     if verbose:
         print(f"\nRunning pyramidal Lucas-Kanade ({pyramid_config_name})...")
     pyramid_config = config["pyramids"][pyramid_config_name]
-    u_pyr, v_pyr = run_pyramidal_lk(frame_prev, frame_curr, pyramid_config)
+    u_pyr, v_pyr = run_pyramidal_lk(frame_prev, frame_curr, pyramid_config, visualize)
 
     metrics_pyr = compute_all_metrics(u_pyr, v_pyr, u_true, v_true, mask)
 
@@ -296,7 +328,7 @@ def verify_pattern(
         print(f"Pyramidal status: {status_pyr}")
 
     # Compile results
-    return {
+    result: dict[str, Any] = {
         "pattern_name": pattern_name,
         "ground_truth": {"u": u_true, "v": v_true},
         "num_test_pixels": int(num_test_pixels),
@@ -310,6 +342,47 @@ def verify_pattern(
             "config": pyramid_config_name,
         },
     }
+    if keep_flow:
+        result["flow_fields"] = (u_single, v_single, u_pyr, v_pyr)
+    return result
+
+
+def _init_verify_worker() -> None:
+    """Pool initializer: one compute thread per worker, the pool already fills the cores."""
+    cv2.setNumThreads(1)
+    if NUMBA_AVAILABLE:
+        import numba
+
+        numba.set_num_threads(1)
+
+
+def _verify_pattern_task(
+    pattern_name: str,
+    visualize: bool,
+    keep_flow: bool,
+    suite_dir: Path,
+    config: dict[str, Any],
+    pyramid_config_name: str,
+) -> Tuple[dict[str, Any], str]:
+    """
+    Load and verify one pattern with its console output captured.
+
+    Returns:
+        Tuple of (verify_pattern results, printed log) so the caller can replay logs in
+        pattern order when patterns run in parallel
+    """
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        result = verify_pattern(
+            pattern_name,
+            load_test_pattern(suite_dir / pattern_name),
+            config,
+            pyramid_config_name=pyramid_config_name,
+            verbose=True,
+            visualize=visualize,
+            keep_flow=keep_flow,
+        )
+    return result, log.getvalue()
 
 
 # ============================================================================
@@ -380,8 +453,7 @@ def save_results_json(results: list[dict[str, Any]], output_path: Path) -> None:
         "patterns": {result["pattern_name"]: result for result in results},
     }
 
-    with open(output_path, "w") as f:
-        json.dump(output_data, f, indent=2)
+    write_json(output_path, output_data)
 
     print(f"\nResults saved: {output_path}")
 
@@ -410,7 +482,7 @@ def visualize_flow_field(
         subsample_step: Arrow spacing (pixels)
         scale: Arrow scale factor
     """
-    import matplotlib.pyplot as plt
+    from matplotlib.figure import Figure
 
     height, width = u.shape
 
@@ -424,7 +496,8 @@ def visualize_flow_field(
     v_sub = v[subsample_step:height:subsample_step, subsample_step:width:subsample_step]
     magnitude = np.sqrt(u_sub**2 + v_sub**2)
 
-    fig, ax = plt.subplots(figsize=(12, 9))
+    fig = Figure(figsize=(12, 9))
+    ax = fig.subplots()
 
     ax.quiver(
         x_coords,
@@ -446,10 +519,9 @@ def visualize_flow_field(
     ax.set_xlabel("X (pixels)")
     ax.set_ylabel("Y (pixels)")
 
-    plt.colorbar(ax.collections[0], ax=ax, label="Flow Magnitude (pixels)")
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches="tight")
-    plt.close()
+    fig.colorbar(ax.collections[0], ax=ax, label="Flow Magnitude (pixels)")
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=100, bbox_inches="tight")
 
 
 def visualize_error_heatmap(
@@ -473,13 +545,14 @@ def visualize_error_heatmap(
         output_path: Where to save
         vmax: Maximum value for colormap
     """
-    import matplotlib.pyplot as plt
+    from matplotlib.figure import Figure
 
     error_u = u_pred - u_true
     error_v = v_pred - v_true
     error_magnitude = np.sqrt(error_u**2 + error_v**2)
 
-    fig, ax = plt.subplots(figsize=(12, 9))
+    fig = Figure(figsize=(12, 9))
+    ax = fig.subplots()
 
     im = ax.imshow(error_magnitude, cmap="hot", vmin=0, vmax=vmax, interpolation="nearest")
     ax.set_title(title)
@@ -487,10 +560,9 @@ def visualize_error_heatmap(
     ax.set_ylabel("Y (pixels)")
     ax.set_aspect("equal")
 
-    plt.colorbar(im, ax=ax, label="Error Magnitude (pixels)")
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches="tight")
-    plt.close()
+    fig.colorbar(im, ax=ax, label="Error Magnitude (pixels)")
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=100, bbox_inches="tight")
 
 
 def generate_visualizations(
@@ -564,6 +636,35 @@ def generate_visualizations(
     print(f"  Saved visualizations to {pattern_dir}")
 
 
+def _generate_visualizations_task(
+    pattern_name: str,
+    flow_fields: Tuple[npt.NDArray[np.float32], ...],
+    suite_dir: Path,
+    output_dir: Path,
+    config: dict[str, Any],
+) -> str:
+    """
+    Load a showcase pattern and render its plots with console output captured.
+
+    Returns:
+        Printed log, replayed by the caller once the plots are written
+    """
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        u_single, v_single, u_pyr, v_pyr = flow_fields
+        generate_visualizations(
+            pattern_name,
+            load_test_pattern(suite_dir / pattern_name),
+            u_single,
+            v_single,
+            u_pyr,
+            v_pyr,
+            output_dir,
+            config,
+        )
+    return log.getvalue()
+
+
 # ============================================================================
 # Baseline Comparison for Regression Testing
 # ============================================================================
@@ -575,12 +676,11 @@ def load_baseline(baseline_path: Path) -> dict[str, Any]:
         print(f"Warning: Baseline file not found: {baseline_path}")
         return {}
 
-    with open(baseline_path, "r") as f:
-        data = json.load(f)
-        if not isinstance(data, dict):
-            print(f"Warning: Baseline file has invalid format: {baseline_path}")
-            return {}
-        return data
+    data = read_json(baseline_path)
+    if not isinstance(data, dict):
+        print(f"Warning: Baseline file has invalid format: {baseline_path}")
+        return {}
+    return data
 
 
 def compare_metrics(
@@ -609,6 +709,10 @@ def compare_metrics(
         curr_val = current.get(metric, 0.0)
         base_val = baseline.get(metric, 0.0)
 
+        # Non-finite metrics are stored as null; compare them as NaN
+        curr_val = float("nan") if curr_val is None else curr_val
+        base_val = float("nan") if base_val is None else base_val
+
         if base_val < 1e-6:  # Avoid division by zero
             if curr_val > 1e-6:
                 flags.append(f"{metric}: {curr_val:.4f} (baseline was 0)")
@@ -729,8 +833,7 @@ def update_baseline(results: list[dict[str, Any]], baseline_path: Path) -> None:
 
     baseline_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(baseline_path, "w") as f:
-        json.dump(baseline_data, f, indent=2)
+    write_json(baseline_path, baseline_data)
 
     print(f"\nBaseline updated: {baseline_path}")
 
@@ -826,56 +929,72 @@ def main() -> None:
 
     print(f"Testing {len(patterns_to_test)} patterns\n")
 
-    # Run verification on each pattern
+    # Run verification on each pattern. Patterns are independent, so they run in worker
+    # processes (one per core) and each pattern's log is printed in order as it completes.
+    # Workers are spawned, not forked: Numba's threading layer is not fork-safe.
+    # The per-level pyramid plots share file names across patterns, so only the pattern
+    # named by visualization.pyramid_plot_pattern in the config renders them (the last
+    # pattern of the run when that one isn't being tested)
     all_results = []
-
-    for pattern_name in patterns_to_test:
-        pattern_dir = suite_dir / pattern_name
-
-        # Load pattern data
-        pattern_data = load_test_pattern(pattern_dir)
-
-        # Run verification
-        result = verify_pattern(
-            pattern_name,
-            pattern_data,
-            config,
-            pyramid_config_name=args.pyramid_config,
-            verbose=True,
-        )
-
-        all_results.append(result)
-
-        # Generate visualizations for showcase patterns
-        if not args.no_visualizations:
-            showcase_patterns = config["visualization"]["showcase_patterns"]
-            if pattern_name in showcase_patterns:
-                # Re-run L-K to get flow fields (could optimize by saving earlier)
-                window_size = config["pyramids"]["default"]["window_size"]
-                u_single, v_single = run_single_scale_lk(
-                    pattern_data["frame_prev"],
-                    pattern_data["frame_curr"],
-                    window_size,
-                )
-
-                pyramid_config_obj = config["pyramids"][args.pyramid_config]
-                u_pyr, v_pyr = run_pyramidal_lk(
-                    pattern_data["frame_prev"],
-                    pattern_data["frame_curr"],
-                    pyramid_config_obj,
+    task = functools.partial(
+        _verify_pattern_task,
+        suite_dir=suite_dir,
+        config=config,
+        pyramid_config_name=args.pyramid_config,
+    )
+    pyramid_plot_pattern = config["visualization"]["pyramid_plot_pattern"]
+    if patterns_to_test and pyramid_plot_pattern not in patterns_to_test:
+        pyramid_plot_pattern = patterns_to_test[-1]
+    visualize_flags = [
+        not args.no_visualizations and pattern_name == pyramid_plot_pattern
+        for pattern_name in patterns_to_test
+    ]
+    # Showcase patterns keep their flow fields for the comparison plots below
+    showcase_patterns = config["visualization"]["showcase_patterns"]
+    keep_flow_flags = [
+        not args.no_visualizations and pattern_name in showcase_patterns
+        for pattern_name in patterns_to_test
+    ]
+    num_workers = min(os.cpu_count() or 1, len(patterns_to_test))
+    viz_futures: list[Future[str]] = []
+
+    with contextlib.ExitStack() as stack:
+        if num_workers > 1:
+            executor = stack.enter_context(
+                ProcessPoolExecutor(
+                    max_workers=num_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_verify_worker,
                 )
-
-                viz_dir = Path(config["output"]["visualizations_dir"])
-                generate_visualizations(
+            )
+            outcomes = executor.map(task, patterns_to_test, visualize_flags, keep_flow_flags)
+        else:
+            outcomes = map(task, patterns_to_test, visualize_flags, keep_flow_flags)
+
+        for pattern_name, (result, log) in zip(patterns_to_test, outcomes):
+            print(log, end="")
+            flow_fields = result.pop("flow_fields", None)
+            all_results.append(result)
+
+            # Render showcase plots from the flow computed above. matplotlib holds the GIL,
+            # so with a pool they go to the worker processes (queued behind the remaining
+            # patterns) instead of stalling this loop; their logs follow the pattern logs
+            if flow_fields is not None:
+                viz_task = functools.partial(
+                    _generate_visualizations_task,
                     pattern_name,
-                    pattern_data,
-                    u_single,
-                    v_single,
-                    u_pyr,
-                    v_pyr,
-                    viz_dir,
+                    flow_fields,
+                    suite_dir,
+                    Path(config["output"]["visualizations_dir"]),
                     config,
                 )
+                if num_workers > 1:
+                    viz_futures.append(executor.submit(viz_task))
+                else:
+                    print(viz_task(), end="")
+
+        for future in viz_futures:
+            print(future.result(), end="")
 
     # Generate outputs
     print("\n" + "=" * 60)
@@ -0,0 +1,55 @@
+# python/tests/test_convert_frames.py
+"""Tests for the .mem frame parser in scripts/convert_frames.py."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+from convert_frames import mem_to_image  # noqa: E402
+
+
+def _write_mem(tmp_path: Path, text: str) -> str:
+    mem_file = tmp_path / "frame.mem"
+    mem_file.write_text(text)
+    return str(mem_file)
+
+
+def test_two_digit_tokens(tmp_path: Path) -> None:
+    mem_file = _write_mem(tmp_path, "// header\n00\n7f\nA0\nff\n")
+    img = np.asarray(mem_to_image(mem_file, 2, 2))
+    np.testing.assert_array_equal(img, [[0x00, 0x7F], [0xA0, 0xFF]])
+
+
+def test_single_digit_tokens(tmp_path: Path) -> None:
+    mem_file = _write_mem(tmp_path, "a\n0f\n3\n10\n")
+    img = np.asarray(mem_to_image(mem_file, 2, 2))
+    np.testing.assert_array_equal(img, [[0x0A, 0x0F], [0x03, 0x10]])
+
+
+def test_uneven_tokens_are_not_mispaired(tmp_path: Path) -> None:
+    # Three digits in two tokens: must decode per token, not as the digit pairs "fa" + "b"
+    mem_file = _write_mem(tmp_path, "f\nab\n")
+    img = np.asarray(mem_to_image(mem_file, 2, 1))
+    np.testing.assert_array_equal(img, [[0x0F, 0xAB]])
+
+
+def test_value_out_of_range(tmp_path: Path) -> None:
+    mem_file = _write_mem(tmp_path, "f\nabc\n")
+    with pytest.raises(ValueError):
+        mem_to_image(mem_file, 2, 1)
+
+
+def test_invalid_hex_digit(tmp_path: Path) -> None:
+    mem_file = _write_mem(tmp_path, "00\nzz\n")
+    with pytest.raises(ValueError):
+        mem_to_image(mem_file, 2, 1)
+
+
+def test_wrong_pixel_count(tmp_path: Path) -> None:
+    mem_file = _write_mem(tmp_path, "00\n01\n02\n")
+    with pytest.raises(ValueError):
+        mem_to_image(mem_file, 2, 2)
@@ -0,0 +1,59 @@
+# python/tests/test_json_io.py
+"""Tests for the shared JSON helpers in json_io.py."""
+
+import math
+from pathlib import Path
+
+import json_io
+import numpy as np
+import pytest
+
+DATA = {"epe": float("nan"), "mae_u": np.float32(0.25), "counts": [1, 2]}
+EXPECTED = {"epe": None, "mae_u": 0.25, "counts": [1, 2]}
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_write_nan_as_null(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, use_orjson: bool
+) -> None:
+    if use_orjson and not json_io.ORJSON_AVAILABLE:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(json_io, "ORJSON_AVAILABLE", use_orjson)
+
+    path = tmp_path / "results.json"
+    json_io.write_json(path, DATA)
+
+    text = path.read_text()
+    assert '"epe": null' in text
+    assert "NaN" not in text
+    assert json_io.read_json(path) == EXPECTED
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_read_legacy_nan_literal(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, use_orjson: bool
+) -> None:
+    if use_orjson and not json_io.ORJSON_AVAILABLE:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(json_io, "ORJSON_AVAILABLE", use_orjson)
+
+    path = tmp_path / "baseline.json"
+    path.write_text('{\n  "epe": NaN,\n  "mae_u": 0.25\n}')
+
+    data = json_io.read_json(path)
+    assert math.isnan(data["epe"])
+    assert data["mae_u"] == 0.25
+
+
+def test_both_encoders_write_the_same_bytes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    if not json_io.ORJSON_AVAILABLE:
+        pytest.skip("orjson not installed")
+    data = {**DATA, "description": "Small rotation (2°)"}
+
+    json_io.write_json(tmp_path / "orjson.json", data)
+    monkeypatch.setattr(json_io, "ORJSON_AVAILABLE", False)
+    json_io.write_json(tmp_path / "json.json", data)
+
+    assert (tmp_path / "orjson.json").read_bytes() == (tmp_path / "json.json").read_bytes()
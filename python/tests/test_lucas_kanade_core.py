@@ -0,0 +1,122 @@
+# python/tests/test_lucas_kanade_core.py
+"""Check the Lucas-Kanade solvers against a plain per-pixel window loop."""
+
+import functools
+from typing import Any, Tuple
+
+import cv2
+import lucas_kanade_core as core
+import numpy as np
+import numpy.typing as npt
+import pytest
+
+# Tall enough that the interior spans several of _lk_kernel's 32-row bands
+HEIGHT, WIDTH = 80, 48
+
+needs_numba = pytest.mark.skipif(not core.NUMBA_AVAILABLE, reason="numba not installed")
+
+
+@functools.lru_cache(maxsize=1)
+def _frames() -> Tuple[npt.NDArray[np.uint8], npt.NDArray[np.uint8]]:
+    """Smoothed random texture and a sub-pixel shifted copy of it."""
+    rng = np.random.default_rng(0)
+    noise = rng.integers(0, 256, size=(HEIGHT, WIDTH)).astype(np.float32)
+    texture = cv2.GaussianBlur(noise, (0, 0), 1.5)
+    texture = (texture - texture.min()) * (255.0 / np.ptp(texture))
+    shift = np.array([[1.0, 0.0, 0.7], [0.0, 1.0, -0.4]])
+    shifted = cv2.warpAffine(texture, shift, (WIDTH, HEIGHT), borderMode=cv2.BORDER_REFLECT)
+    return (
+        np.rint(texture).astype(np.uint8),
+        np.rint(shifted).astype(np.uint8),
+    )
+
+
+@functools.lru_cache(maxsize=4)
+def _reference_flow(window_size: int) -> Tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    """Per-pixel window sums and 2x2 solve, as in the original implementation."""
+    frame_prev, frame_curr = _frames()
+    Ix, Iy, It = (
+        g.astype(np.float64)
+        for g in core.compute_gradients(
+            frame_prev.astype(np.float32), frame_curr.astype(np.float32)
+        )
+    )
+
+    u = np.zeros((HEIGHT, WIDTH))
+    v = np.zeros((HEIGHT, WIDTH))
+    half_win = window_size // 2
+    for y in range(half_win, HEIGHT - half_win):
+        for x in range(half_win, WIDTH - half_win):
+            window = (slice(y - half_win, y + half_win + 1), slice(x - half_win, x + half_win + 1))
+            wx, wy, wt = Ix[window], Iy[window], It[window]
+            sxx, syy, sxy = np.sum(wx * wx), np.sum(wy * wy), np.sum(wx * wy)
+            sxt, syt = np.sum(wx * wt), np.sum(wy * wt)
+            det = sxx * syy - sxy * sxy
+            if abs(det) > 1e-4:
+                u[y, x] = (sxy * syt - syy * sxt) / det
+                v[y, x] = (sxy * sxt - sxx * syt) / det
+    return u, v
+
+
+def _assert_matches_reference(
+    u: npt.NDArray[np.float32], v: npt.NDArray[np.float32], window_size: int
+) -> None:
+    u_ref, v_ref = _reference_flow(window_size)
+    np.testing.assert_allclose(u, u_ref, rtol=0, atol=1e-5)
+    np.testing.assert_allclose(v, v_ref, rtol=0, atol=1e-5)
+
+
+@pytest.mark.parametrize("use_numba", [pytest.param(True, marks=needs_numba), False])
+@pytest.mark.parametrize("dtype", [np.float32, np.uint8])
+@pytest.mark.parametrize("window_size", [3, 5, 7])
+def test_single_scale_matches_reference(
+    monkeypatch: pytest.MonkeyPatch, use_numba: bool, dtype: type, window_size: int
+) -> None:
+    # Window 5 runs _lk5, other sizes _lk_kernel; uint8 frames take the int16 path
+    monkeypatch.setattr(core, "NUMBA_AVAILABLE", use_numba)
+    frame_prev: npt.NDArray[Any] = _frames()[0].astype(dtype)
+    frame_curr: npt.NDArray[Any] = _frames()[1].astype(dtype)
+
+    u, v = core.lucas_kanade_single_scale(frame_prev, frame_curr, window_size)
+
+    _assert_matches_reference(u, v, window_size)
+
+
+@needs_numba
+@pytest.mark.parametrize("fixed_point", [False, True])
+def test_lk5_matches_generic_kernel(fixed_point: bool) -> None:
+    frame_prev, frame_curr = _frames()
+    gradients: Tuple[npt.NDArray[Any], npt.NDArray[Any], npt.NDArray[Any]]
+    if fixed_point:
+        gradients = core.compute_gradients_fixed(frame_prev, frame_curr)
+        scale = core.GRADIENT_FIXED_SCALE
+    else:
+        gradients = core.compute_gradients(
+            frame_prev.astype(np.float32), frame_curr.astype(np.float32)
+        )
+        scale = 1.0
+
+    Ix, Iy, It = gradients
+    u5 = np.empty((HEIGHT, WIDTH), dtype=np.float32)
+    v5 = np.empty_like(u5)
+    u = np.empty_like(u5)
+    v = np.empty_like(u5)
+    core._lk5(Ix, Iy, It, scale, u5, v5)
+    core._lk_kernel(Ix, Iy, It, 5, scale, u, v)
+
+    np.testing.assert_allclose(u5, u, rtol=0, atol=1e-5)
+    np.testing.assert_allclose(v5, v, rtol=0, atol=1e-5)
+
+
+def test_fixed_point_gradients_match_float() -> None:
+    frame_prev, frame_curr = _frames()
+
+    Ix16, Iy16, It16 = core.compute_gradients_fixed(frame_prev, frame_curr)
+    Ix, Iy, It = core.compute_gradients(
+        frame_prev.astype(np.float32), frame_curr.astype(np.float32)
+    )
+
+    assert Ix16.dtype == Iy16.dtype == It16.dtype == np.int16
+    np.testing.assert_array_equal(Ix16 * np.float32(core.GRADIENT_FIXED_SCALE), Ix)
+    np.testing.assert_array_equal(Iy16 * np.float32(core.GRADIENT_FIXED_SCALE), Iy)
+    np.testing.assert_array_equal(It16.astype(np.float32), It)
@@ -6,29 +6,57 @@ Convert .mem files to PNG images for visualization overlay.
 Reads frame_00.mem and frame_01.mem hex files and saves as PNG.
 """
 
+import re
 from pathlib import Path
 
 import numpy as np
 from PIL import Image
 
+# ASCII byte -> hex nibble value; _SPACE marks whitespace, _INVALID anything else
+_SPACE = 0xFE
+_INVALID = 0xFF
+_HEX_LUT = np.full(256, _INVALID, dtype=np.uint8)
+_HEX_LUT[np.frombuffer(b" \t\n\v\f\r", dtype=np.uint8)] = _SPACE
+_HEX_LUT[np.frombuffer(b"0123456789", dtype=np.uint8)] = np.arange(10)
+_HEX_LUT[np.frombuffer(b"abcdef", dtype=np.uint8)] = np.arange(10, 16)
+_HEX_LUT[np.frombuffer(b"ABCDEF", dtype=np.uint8)] = np.arange(10, 16)
+
 
 def mem_to_image(mem_file: str, width: int, height: int) -> Image.Image:
     """Read .mem file (hex values, one per line) and convert to image."""
-    pixels = []
-
-    with open(mem_file, "r") as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith("//"):
-                # Parse hex value
-                val = int(line, 16)
-                pixels.append(val)
-
-    if len(pixels) != width * height:
-        raise ValueError(f"Expected {width*height} pixels, got {len(pixels)}")
+    raw = Path(mem_file).read_bytes()
+
+    # Drop comment lines (generated files have none, so usually no copy is made)
+    if b"//" in raw:
+        raw = re.sub(rb"(?m)^\s*//.*$", b"", raw)
+
+    # Classify every byte through the lookup table at once
+    nibbles = _HEX_LUT[np.frombuffer(raw, dtype=np.uint8)]
+    if nibbles.max(initial=0) == _INVALID:
+        raise ValueError(f"Invalid hex digit in {mem_file}")
+
+    # One pixel per whitespace-separated token; token bounds come from digit/space transitions
+    is_digit = nibbles != _SPACE
+    edges = np.diff(is_digit.astype(np.int8), prepend=np.int8(0), append=np.int8(0))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    num_pixels = starts.size
+    if num_pixels != width * height:
+        raise ValueError(f"Expected {width*height} pixels, got {num_pixels}")
+
+    if np.all(ends - starts == 2):
+        # Generated files: every token is two digits, so combine digit pairs into bytes
+        digits = nibbles[is_digit]
+        pixels = (digits[0::2] << 4) | digits[1::2]
+    else:
+        # Hand-edited files may have other token widths: parse each token on its own
+        values = [int(token, 16) for token in raw.split()]
+        if max(values) > 0xFF:
+            raise ValueError(f"Hex value out of 8-bit range in {mem_file}")
+        pixels = np.array(values, dtype=np.uint8)
 
     # Reshape to 2D array
-    img_array = np.array(pixels, dtype=np.uint8).reshape((height, width))
+    img_array = pixels.reshape((height, width))
 
     return Image.fromarray(img_array, mode="L")
 
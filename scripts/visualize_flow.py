@@ -11,46 +11,48 @@ Creates comprehensive 4-panel diagnostic plot:
 """
 
 import argparse
+import io
+import re
 from pathlib import Path
 from typing import Dict, Tuple
 
-import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.figure import Figure
 from matplotlib.patches import Rectangle
 from PIL import Image
 
+# Header lines written by the testbench, e.g.
+#   # Image size: 320x240
+#   # Test region: x[55:85], y[105:135]
+_IMAGE_SIZE_RE = re.compile(r"^\s*#.*Image size:\s*(\d+)\s*x\s*(\d+)", re.MULTILINE)
+_TEST_REGION_X_RE = re.compile(r"^\s*#.*Test region:.*?x\[(\d+):(\d+)\]", re.MULTILINE)
+_TEST_REGION_Y_RE = re.compile(r"^\s*#.*Test region:.*?y\[(\d+):(\d+)\]", re.MULTILINE)
+
 
 def parse_flow_field(
     file_path: str,
 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict[str, int]]:
     """Parse flow field text file (x y u v format)."""
-    data = np.loadtxt(file_path, comments="#")
+    # Read the file once; the samples and the header are both parsed from this text
+    text = Path(file_path).read_text()
+    data = np.loadtxt(io.StringIO(text), comments="#", dtype=np.float32)
 
-    # Extract metadata from header
+    # Extract metadata from the "#" header lines
     metadata: Dict[str, int] = {}
-    with open(file_path, "r") as f:
-        for line in f:
-            if "Image size:" in line:
-                parts = line.split(":")
-                if len(parts) > 1:
-                    dims = parts[1].strip().replace("x", " ").split()
-                    if len(dims) >= 2:
-                        metadata["width"] = int(dims[0])
-                        metadata["height"] = int(dims[1])
-            elif "Test region:" in line:
-                # Parse: x[55:85], y[105:135]
-                parts = line.split("x[")
-                if len(parts) > 1:
-                    x_part = parts[1].split("]")[0]
-                    x_vals = x_part.split(":")
-                    metadata["test_x_min"] = int(x_vals[0])
-                    metadata["test_x_max"] = int(x_vals[1])
-
-                if "y[" in line:
-                    y_part = line.split("y[")[1].split("]")[0]
-                    y_vals = y_part.split(":")
-                    metadata["test_y_min"] = int(y_vals[0])
-                    metadata["test_y_max"] = int(y_vals[1])
+    match = _IMAGE_SIZE_RE.search(text)
+    if match:
+        metadata["width"] = int(match[1])
+        metadata["height"] = int(match[2])
+
+    match = _TEST_REGION_X_RE.search(text)
+    if match:
+        metadata["test_x_min"] = int(match[1])
+        metadata["test_x_max"] = int(match[2])
+
+    match = _TEST_REGION_Y_RE.search(text)
+    if match:
+        metadata["test_y_min"] = int(match[1])
+        metadata["test_y_max"] = int(match[2])
 
     x = data[:, 0]
     y = data[:, 1]
@@ -60,6 +62,19 @@ def parse_flow_field(
     return x, y, u, v, metadata
 
 
+def _test_region_patch(metadata: Dict[str, int]) -> Rectangle:
+    """Dashed outline of the test region (a patch belongs to one axes, so one per panel)."""
+    return Rectangle(
+        (metadata["test_x_min"], metadata["test_y_min"]),
+        metadata["test_x_max"] - metadata["test_x_min"],
+        metadata["test_y_max"] - metadata["test_y_min"],
+        linewidth=2,
+        edgecolor="cyan",
+        facecolor="none",
+        linestyle="--",
+    )
+
+
 def create_diagnostic_plot(
     frame_path: str,
     flow_file: str,
@@ -68,6 +83,7 @@ def create_diagnostic_plot(
     ground_truth_v: float = 0.0,
     stride: int = 10,
     scale: float = 20.0,
+    dpi: int = 150,
 ) -> None:
     """
     Create comprehensive 4-panel diagnostic visualization.
@@ -80,6 +96,7 @@ def create_diagnostic_plot(
         ground_truth_v: Expected vertical flow
         stride: Arrow subsampling stride
         scale: Arrow scale factor
+        dpi: Output resolution (lower renders faster for batch runs)
     """
     # Load frame
     frame = Image.open(frame_path)
@@ -90,25 +107,26 @@ def create_diagnostic_plot(
     x, y, u, v, metadata = parse_flow_field(flow_file)
 
     # Compute flow magnitude
-    magnitude = np.sqrt(u**2 + v**2)
+    magnitude = np.hypot(u, v)
 
     # Create flow field grids for heatmaps
-    u_field = np.zeros((height, width))
-    v_field = np.zeros((height, width))
-    mag_field = np.zeros((height, width))
-
-    for i in range(len(x)):
-        xi = int(x[i])
-        yi = int(y[i])
-        if 0 <= xi < width and 0 <= yi < height:
-            u_field[yi, xi] = u[i]
-            v_field[yi, xi] = v[i]
-            mag_field[yi, xi] = magnitude[i]
+    u_field = np.zeros((height, width), dtype=np.float32)
+    v_field = np.zeros((height, width), dtype=np.float32)
+    mag_field = np.zeros((height, width), dtype=np.float32)
+
+    # Scatter samples into the grids in one indexing op (astype truncates like int())
+    xi = x.astype(np.intp)
+    yi = y.astype(np.intp)
+    in_bounds = (xi >= 0) & (xi < width) & (yi >= 0) & (yi < height)
+    xi, yi = xi[in_bounds], yi[in_bounds]
+    u_field[yi, xi] = u[in_bounds]
+    v_field[yi, xi] = v[in_bounds]
+    mag_field[yi, xi] = magnitude[in_bounds]
 
     # Compute error vs ground truth
     error_u = u_field - ground_truth_u
     error_v = v_field - ground_truth_v
-    error_mag = np.sqrt(error_u**2 + error_v**2)
+    error_mag = np.hypot(error_u, error_v)
 
     # Extract test region statistics
     if all(k in metadata for k in ["test_x_min", "test_y_min", "test_x_max", "test_y_max"]):
@@ -145,7 +163,8 @@ def create_diagnostic_plot(
         num_vectors = len(u)
 
     # Create 2x2 subplot figure
-    fig = plt.figure(figsize=(16, 12), dpi=150)
+    # Figure API directly (Agg canvas), no pyplot state to set up or close
+    fig = Figure(figsize=(16, 12), dpi=dpi)
     gs = fig.add_gridspec(2, 2, hspace=0.3, wspace=0.3)
 
     # --- Top-Left: Flow Field Quiver ---
@@ -153,14 +172,13 @@ def create_diagnostic_plot(
     extent = (0, width, height, 0)
     ax1.imshow(frame_array, cmap="gray", extent=extent)
 
-    # Subsample for quiver
-    indices = np.arange(0, len(x), stride)
+    # Subsample for quiver (strided views, no index array or copies)
     ax1.quiver(
-        x[indices],
-        y[indices],
-        u[indices],
-        v[indices],
-        magnitude[indices],
+        x[::stride],
+        y[::stride],
+        u[::stride],
+        v[::stride],
+        magnitude[::stride],
         angles="xy",
         scale_units="xy",
         scale=1.0 / scale,
@@ -172,16 +190,7 @@ def create_diagnostic_plot(
 
     # Highlight test region
     if "test_x_min" in metadata:
-        rect = Rectangle(
-            (metadata["test_x_min"], metadata["test_y_min"]),
-            metadata["test_x_max"] - metadata["test_x_min"],
-            metadata["test_y_max"] - metadata["test_y_min"],
-            linewidth=2,
-            edgecolor="cyan",
-            facecolor="none",
-            linestyle="--",
-        )
-        ax1.add_patch(rect)
+        ax1.add_patch(_test_region_patch(metadata))
         ax1.text(
             metadata["test_x_min"] + 2,
             metadata["test_y_min"] + 2,
@@ -201,23 +210,14 @@ def create_diagnostic_plot(
     im2 = ax2.imshow(mag_field, cmap="hot", extent=extent, vmin=0, vmax=np.max(magnitude))
 
     if "test_x_min" in metadata:
-        rect2 = Rectangle(
-            (metadata["test_x_min"], metadata["test_y_min"]),
-            metadata["test_x_max"] - metadata["test_x_min"],
-            metadata["test_y_max"] - metadata["test_y_min"],
-            linewidth=2,
-            edgecolor="cyan",
-            facecolor="none",
-            linestyle="--",
-        )
-        ax2.add_patch(rect2)
+        ax2.add_patch(_test_region_patch(metadata))
 
     ax2.set_title("Flow Magnitude Heatmap", fontsize=12, pad=10)
     ax2.set_xlabel("X (pixels)")
     ax2.set_ylabel("Y (pixels)")
     ax2.set_aspect("equal")
 
-    cbar2 = plt.colorbar(im2, ax=ax2, fraction=0.046, pad=0.04)
+    cbar2 = fig.colorbar(im2, ax=ax2, fraction=0.046, pad=0.04)
     cbar2.set_label("Magnitude (pixels)", rotation=270, labelpad=15)
 
     # --- Bottom-Left: Component Distribution ---
@@ -282,28 +282,18 @@ def create_diagnostic_plot(
     im4 = ax4.imshow(error_mag, cmap="viridis", extent=extent, vmin=0, vmax=np.max(error_mag))
 
     if "test_x_min" in metadata:
-        rect4 = Rectangle(
-            (metadata["test_x_min"], metadata["test_y_min"]),
-            metadata["test_x_max"] - metadata["test_x_min"],
-            metadata["test_y_max"] - metadata["test_y_min"],
-            linewidth=2,
-            edgecolor="cyan",
-            facecolor="none",
-            linestyle="--",
-        )
-        ax4.add_patch(rect4)
+        ax4.add_patch(_test_region_patch(metadata))
 
     ax4.set_title("Error Magnitude vs Ground Truth", fontsize=12, pad=10)
     ax4.set_xlabel("X (pixels)")
     ax4.set_ylabel("Y (pixels)")
     ax4.set_aspect("equal")
 
-    cbar4 = plt.colorbar(im4, ax=ax4, fraction=0.046, pad=0.04)
+    cbar4 = fig.colorbar(im4, ax=ax4, fraction=0.046, pad=0.04)
     cbar4.set_label("Error (pixels)", rotation=270, labelpad=15)
 
     # Save figure
-    plt.savefig(output_path, dpi=150, bbox_inches="tight")
-    plt.close()
+    fig.savefig(output_path, dpi=dpi, bbox_inches="tight")
 
 
 def main() -> None:
@@ -347,6 +337,12 @@ def main() -> None:
         default=7.0,
         help="Arrow scale factor",
     )
+    parser.add_argument(
+        "--dpi",
+        type=int,
+        default=150,
+        help="Output resolution (e.g. 100 for faster batch/CI runs)",
+    )
 
     args = parser.parse_args()
 
@@ -374,6 +370,7 @@ def main() -> None:
         ground_truth_v=args.ground_truth_v,
         stride=args.stride,
         scale=args.scale,
+        dpi=args.dpi,
     )
 
     print(f"Generated: {args.output}")